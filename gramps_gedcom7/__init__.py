@@ -1,2 +1,3 @@
 from .importer import import_gedcom
+from .report import ImportReport
 from .settings import ImportSettings
@@ -0,0 +1,144 @@
+"""Add Gramps objects to an SQLite database in bulk."""
+
+from __future__ import annotations
+
+import contextlib
+import time
+from collections import defaultdict
+from typing import Callable, Iterator
+
+from gramps.gen.db import DbTxn, DbWriteBase
+from gramps.gen.db.dbconst import KEY_TO_NAME_MAP
+from gramps.gen.lib.primaryobj import BasicPrimaryObject
+
+# Old SQLite versions allow at most 999 parameters per statement
+MAX_PARAMETERS = 999
+
+# Number of buffered objects after which their rows are written
+FLUSH_OBJECTS = 5000
+
+
+def supports_bulk_write(db: DbWriteBase) -> bool:
+    """Return whether the database backend supports bulk writing."""
+    return db.__class__.__name__ == "SQLite"
+
+
+@contextlib.contextmanager
+def bulk_writer(
+    db: DbWriteBase,
+    transaction: DbTxn,
+    add_object: Callable[[BasicPrimaryObject, DbWriteBase, DbTxn], None],
+) -> Iterator[Callable[[BasicPrimaryObject], None]]:
+    """Buffer the rows written by the database and insert them in batches.
+
+    Objects still go through the database's ``add_*`` and ``commit_*`` methods,
+    so Gramps IDs, gender statistics, surname groups and custom type names are
+    maintained exactly as on the normal path. Only the per-object SQL
+    statements are replaced: the serialized object, its secondary columns and
+    its reference map rows are buffered and written with a few multi-row
+    INSERT statements every FLUSH_OBJECTS objects and when the context exits.
+
+    Objects already in the database, e.g. when re-importing a file with
+    deterministic handles, are updated on the normal path. No undo data is
+    stored and no signals are emitted for new objects.
+
+    Args:
+        db: The Gramps database. Must use the SQLite backend.
+        transaction: The open transaction the rows are written in.
+        add_object: The function adding a single object on the normal path.
+
+    Yields:
+        A function adding a single object to the database.
+    """
+    if not supports_bulk_write(db):
+        raise ValueError(
+            f"Bulk writing requires the SQLite backend, got {db.__class__.__name__}"
+        )
+    rows: dict[str, list[list]] = defaultdict(list)
+    columns: dict[str, list[str]] = {}
+    references: list[list[str]] = []
+    pending_ids: set[tuple[int, str]] = set()
+    pending_handles: set[tuple[int, str]] = set()
+    commit_base = db._commit_base
+    has_gramps_id = db._has_gramps_id
+
+    def flush() -> None:
+        for table, table_rows in rows.items():
+            _insert_many(db, table, columns[table], table_rows)
+        _insert_many(
+            db,
+            "reference",
+            ["obj_handle", "obj_class", "ref_handle", "ref_class"],
+            references,
+        )
+        rows.clear()
+        references.clear()
+        pending_ids.clear()
+        pending_handles.clear()
+
+    def _commit_base(obj, obj_key, trans, change_time):
+        if (obj_key, obj.handle) in pending_handles:
+            # committed twice: update the written row
+            flush()
+        if db._has_handle(obj_key, obj.handle):
+            return commit_base(obj, obj_key, trans, change_time)
+        obj.change = int(change_time or time.time())
+        table = KEY_TO_NAME_MAP[obj_key]
+        names, values = _row(db, obj)
+        columns.setdefault(table, names)
+        rows[table].append(values)
+        for ref_class_name, ref_handle in set(obj.get_referenced_handles_recursively()):
+            references.append(
+                [obj.handle, obj.__class__.__name__, ref_handle, ref_class_name]
+            )
+        pending_ids.add((obj_key, obj.gramps_id))
+        pending_handles.add((obj_key, obj.handle))
+        if len(pending_handles) >= FLUSH_OBJECTS:
+            flush()
+        return None
+
+    def _has_gramps_id(obj_key, gramps_id):
+        return (obj_key, gramps_id) in pending_ids or has_gramps_id(obj_key, gramps_id)
+
+    # shadow the backend's per-object write methods on this instance only
+    db._commit_base = _commit_base
+    db._has_gramps_id = _has_gramps_id
+    try:
+        yield lambda obj: add_object(obj, db, transaction)
+    finally:
+        del db._commit_base
+        del db._has_gramps_id
+    flush()
+
+
+def _row(db: DbWriteBase, obj: BasicPrimaryObject) -> tuple[list[str], list]:
+    """Get the column names and values of the table row for an object."""
+    names = ["handle", db.serializer.data_field]
+    values = [obj.handle, db.serializer.object_to_string(obj)]
+    for field, _, _ in obj.get_secondary_fields():
+        if field != "handle":
+            names.append(field)
+            values.append(getattr(obj, field))
+    # derived columns, as set by DBAPI._update_secondary_values
+    if obj.__class__.__name__ == "Person":
+        names += ["given_name", "surname"]
+        values += list(db._get_person_data(obj))
+    elif obj.__class__.__name__ == "Place":
+        names.append("enclosed_by")
+        values.append(db._get_place_data(obj))
+    return names, [int(v) if isinstance(v, bool) else v for v in values]
+
+
+def _insert_many(
+    db: DbWriteBase, table: str, names: list[str], rows: list[list]
+) -> None:
+    """Insert rows into a table with as few statements as possible."""
+    rows_per_statement = max(1, MAX_PARAMETERS // len(names))
+    placeholder = "(" + ", ".join("?" * len(names)) + ")"
+    for start in range(0, len(rows), rows_per_statement):
+        chunk = rows[start : start + rows_per_statement]
+        db.dbapi.execute(
+            f"INSERT INTO {table} ({', '.join(names)}) VALUES "
+            + ", ".join([placeholder] * len(chunk)),
+            [value for row in chunk for value in row],
+        )
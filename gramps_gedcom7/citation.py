@@ -34,7 +34,7 @@ def handle_citation(
         A list of Gramps objects created from the GEDCOM structure.
     """
     citation = Citation()
-    citation.handle = util.make_handle()
+    citation.handle = util.structure_handle(structure)
     if structure.pointer != g7grammar.voidptr and structure.pointer in xref_handle_map:
         citation.source_handle = xref_handle_map.get(structure.pointer)
     objects = []
@@ -67,10 +67,13 @@ def handle_citation(
                 util.add_attribute_to_object(citation, "EVEN", child.value)
                 
                 # Check for ROLE substructure
-                for even_child in child.children:
-                    if even_child.tag == g7const.ROLE:
-                        if even_child.value is not None:
-                            assert isinstance(even_child.value, str), "Expected value to be a string"
-                            util.add_attribute_to_object(citation, "EVEN:ROLE", even_child.value)
+                for even_child in util.children_with_tag(child, g7const.ROLE):
+                    if even_child.value is not None:
+                        assert isinstance(
+                            even_child.value, str
+                        ), "Expected value to be a string"
+                        util.add_attribute_to_object(
+                            citation, "EVEN:ROLE", even_child.value
+                        )
         # TODO handle DATA
     return citation, objects
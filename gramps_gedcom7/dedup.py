@@ -0,0 +1,126 @@
+"""Reuse one object for identical inline objects of different records."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import Counter
+
+from gramps.gen.lib import Citation, Note
+from gramps.gen.lib.citationbase import CitationBase
+from gramps.gen.lib.notebase import NoteBase
+from gramps.gen.lib.primaryobj import BasicPrimaryObject
+from gramps.gen.lib.serialize import object_to_dict
+
+
+def _digest(text: str) -> bytes:
+    """Hash a text, so that the index does not keep every distinct text."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def _note_key(note: Note) -> tuple:
+    """Get the key of an inline note: its text, format and type.
+
+    The text includes the translations.
+    """
+    note_type = note.get_type()
+    return _digest(note.get()), note.get_format(), note_type.value, note_type.string
+
+
+def _citation_key(citation: Citation, inline_notes: dict[str, Note]) -> bytes:
+    """Get the key of a citation: its content, with inline notes by content."""
+    data = object_to_dict(citation)
+    for name in ("handle", "gramps_id", "change"):
+        del data[name]
+    data["note_list"] = [
+        _note_key(inline_notes[handle]) if handle in inline_notes else handle
+        for handle in data["note_list"]
+    ]
+    return _digest(json.dumps(data, sort_keys=True, default=repr))
+
+
+class InlineDeduplicator:
+    """Replace inline objects by identical ones of earlier records.
+
+    Inline objects are only referred to by the objects of the record they
+    were created for, so a duplicate is dropped from the objects of its
+    record and their references are redirected to the first identical
+    object. Objects of shared records, like SNOTE, are never replaced.
+
+    Args:
+        shared_handles: Handles of the objects created for level-0 records.
+        notes: Deduplicate inline notes.
+        citations: Deduplicate citations, including their inline notes.
+    """
+
+    def __init__(
+        self, shared_handles: set[str], notes: bool = False, citations: bool = False
+    ):
+        self.shared_handles = shared_handles
+        self.notes = notes
+        self.citations = citations
+        self.note_handles: dict[tuple, str] = {}
+        self.citation_handles: dict[bytes, str] = {}
+        # number of replaced objects, by class name
+        self.replaced: Counter[str] = Counter()
+
+    def deduplicate(
+        self, objects: list[BasicPrimaryObject]
+    ) -> list[BasicPrimaryObject]:
+        """Drop the duplicates among the objects of a record.
+
+        Args:
+            objects: The objects created for a record. References to dropped
+                objects are updated in place.
+
+        Returns:
+            The objects that were kept.
+        """
+        dropped: set[str] = set()
+        citation_map: dict[str, str] = {}
+        if self.citations:
+            inline_notes = {
+                obj.handle: obj
+                for obj in objects
+                if isinstance(obj, Note) and obj.handle not in self.shared_handles
+            }
+            for obj in objects:
+                if isinstance(obj, Citation):
+                    key = _citation_key(obj, inline_notes)
+                    handle = self.citation_handles.setdefault(key, obj.handle)
+                    if handle != obj.handle:
+                        citation_map[obj.handle] = handle
+                        # only the dropped citation refers to its inline notes
+                        dropped.update(
+                            note_handle
+                            for note_handle in obj.get_note_list()
+                            if note_handle in inline_notes
+                        )
+            dropped.update(citation_map)
+        note_map: dict[str, str] = {}
+        if self.notes:
+            for obj in objects:
+                if (
+                    isinstance(obj, Note)
+                    and obj.handle not in self.shared_handles
+                    and obj.handle not in dropped
+                ):
+                    handle = self.note_handles.setdefault(_note_key(obj), obj.handle)
+                    if handle != obj.handle:
+                        note_map[obj.handle] = handle
+            dropped.update(note_map)
+        if not dropped:
+            return objects
+        kept = []
+        for obj in objects:
+            if obj.handle in dropped:
+                self.replaced[obj.__class__.__name__] += 1
+                continue
+            kept.append(obj)
+            if isinstance(obj, NoteBase):
+                for old_handle, new_handle in note_map.items():
+                    obj.replace_note_references(old_handle, new_handle)
+            if isinstance(obj, CitationBase):
+                for old_handle, new_handle in citation_map.items():
+                    obj.replace_citation_references(old_handle, new_handle)
+        return kept
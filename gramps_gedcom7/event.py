@@ -1,9 +1,13 @@
 """Process GEDCOM 7 event data."""
 
+import math
+import sys
+import unicodedata
+
 from gedcom7 import const as g7const
 from gedcom7 import grammar as g7grammar
 from gedcom7 import types as g7types
-from gedcom7 import util as g7util
+from gramps.gen.db import DbReadBase
 from gramps.gen.lib import (
     AttributeType,
     Event,
@@ -19,9 +23,201 @@ from gramps.gen.lib.primaryobj import BasicPrimaryObject
 
 from . import util
 from .citation import handle_citation
+from .report import CountingDict
 from .settings import ImportSettings
 
 
+# Mean length of a degree of latitude in meters
+METERS_PER_DEGREE = 111_195.0
+
+# Normalizations of place names for deduplication, in the order applied
+PLACE_NAME_NORMALIZATIONS = ("nfc", "whitespace", "casefold")
+
+
+def normalize_place_name(name: str, normalization: tuple[str, ...] = ()) -> str:
+    """Normalize a place name for use as a deduplication key.
+
+    Args:
+        name: The place name.
+        normalization: The normalizations to apply: "nfc" for Unicode NFC,
+            "whitespace" to strip and collapse whitespace, and "casefold" to
+            ignore case.
+
+    Returns:
+        The normalized name, interned so that equal keys share one string.
+    """
+    if "nfc" in normalization:
+        name = unicodedata.normalize("NFC", name)
+    if "whitespace" in normalization:
+        name = " ".join(name.split())
+    if "casefold" in normalization:
+        name = name.casefold()
+    return sys.intern(name)
+
+
+def _parse_coordinate(text: str) -> float | None:
+    """Parse a GEDCOM latitude or longitude like N18.150944 or W0.1278."""
+    sign = -1.0 if text[:1] in ("S", "W") else 1.0
+    try:
+        return sign * float(text.lstrip("NSEW"))
+    except ValueError:
+        return None
+
+
+def _distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in meters between two coordinates in degrees."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * METERS_PER_DEGREE * math.degrees(math.asin(min(1.0, math.sqrt(a))))
+
+
+class PlaceCache(CountingDict[tuple[tuple[str, ...], str | None], str]):
+    """Cache mapping ((jurisdiction_name,), parent_handle) to place handles.
+
+    In addition, ``paths`` memoizes the handle of the lowest place for each
+    full jurisdiction list and FORM, so that places seen before are found
+    with a single lookup instead of one per jurisdiction level. Removing a
+    place from the cache invalidates the memo.
+
+    With a merge distance, places with coordinates are also indexed on a grid
+    of cells as large as the merge distance, by parent place, so that finding
+    a nearby place only has to look at the places of the neighbouring cells.
+
+    Jurisdiction names in the keys are normalized with normalize_place_name.
+
+    Args:
+        merge_distance: Distance in meters within which a new place is merged
+            into an existing place with the same parent, or None.
+        normalization: The normalizations of jurisdiction names in the keys,
+            see normalize_place_name.
+    """
+
+    def __init__(
+        self,
+        *args,
+        merge_distance: float | None = None,
+        normalization: tuple[str, ...] = (),
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        if merge_distance is not None and merge_distance <= 0:
+            raise ValueError("The place merge distance must be positive")
+        unknown = set(normalization) - set(PLACE_NAME_NORMALIZATIONS)
+        if unknown:
+            raise ValueError(f"Unknown place name normalization: {sorted(unknown)}")
+        self.merge_distance = merge_distance
+        self.normalization = tuple(normalization)
+        self.paths: dict[tuple[tuple[str, ...], tuple[str, ...] | None], str] = {}
+        self.locations: dict[
+            tuple[str | None, int, int], list[tuple[float, float, str]]
+        ] = {}
+        self._location_cells: dict[str, tuple[str | None, int, int]] = {}
+
+    def __delitem__(self, key) -> None:
+        handle = self[key]
+        super().__delitem__(key)
+        self.paths.clear()
+        cell = self._location_cells.pop(handle, None)
+        if cell is not None:
+            self.locations[cell] = [
+                location for location in self.locations[cell] if location[2] != handle
+            ]
+
+    def name_key(self, name: str) -> str:
+        """Get the key of a jurisdiction name."""
+        return normalize_place_name(name, self.normalization)
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        assert self.merge_distance is not None
+        size = self.merge_distance / METERS_PER_DEGREE
+        return math.floor(latitude / size), math.floor(longitude / size)
+
+    def add_location(
+        self, parent_handle: str | None, latitude: str, longitude: str, handle: str
+    ) -> None:
+        """Index the coordinates of a place, if places are merged by distance."""
+        if self.merge_distance is None:
+            return
+        lat = _parse_coordinate(latitude)
+        lon = _parse_coordinate(longitude)
+        if lat is None or lon is None:
+            return
+        cell = (parent_handle, *self._cell(lat, lon))
+        self.locations.setdefault(cell, []).append((lat, lon, handle))
+        self._location_cells[handle] = cell
+
+    def find_nearby(
+        self, parent_handle: str | None, latitude: str, longitude: str
+    ) -> str | None:
+        """Find the nearest place within the merge distance with the same parent.
+
+        Returns:
+            The handle of the place, or None if there is none or places are
+            not merged by distance.
+        """
+        if self.merge_distance is None or not self.locations:
+            return None
+        lat = _parse_coordinate(latitude)
+        lon = _parse_coordinate(longitude)
+        if lat is None or lon is None:
+            return None
+        row, column = self._cell(lat, lon)
+        # cells span fewer meters of longitude towards the poles
+        size = self.merge_distance / METERS_PER_DEGREE
+        cos_lat = math.cos(math.radians(min(90.0, abs(lat) + size)))
+        columns = min(math.ceil(1 / max(cos_lat, 1e-9)), math.ceil(180 / size))
+        nearest = None
+        nearest_distance = self.merge_distance
+        for cell_row in range(row - 1, row + 2):
+            for cell_column in range(column - columns, column + columns + 1):
+                for other_lat, other_lon, handle in self.locations.get(
+                    (parent_handle, cell_row, cell_column), []
+                ):
+                    distance = _distance(lat, lon, other_lat, other_lon)
+                    if distance <= nearest_distance:
+                        nearest, nearest_distance = handle, distance
+        return nearest
+
+    def get_path(
+        self, key: tuple[tuple[str, ...], tuple[str, ...] | None]
+    ) -> str | None:
+        """Get the handle of the lowest place of a memoized jurisdiction list.
+
+        A hit counts as a cache hit for each jurisdiction level, like the
+        lookups it replaces.
+        """
+        handle = self.paths.get(key)
+        if handle is not None:
+            self.hits += len(key[0])
+        return handle
+
+
+def preload_place_cache(db: DbReadBase, place_cache: PlaceCache) -> None:
+    """Add the places of a database to the place cache.
+
+    The places are read in a single scan of the raw place data, without
+    creating Place objects. If several places have the same name and parent
+    place, the first one is used. Places without a name or parent place are
+    skipped, since places with an empty jurisdiction list are never shared.
+
+    Args:
+        db: The Gramps database.
+        place_cache: The place cache to add the places to.
+    """
+    for handle, data in db._iter_raw_place_data():
+        name = data["name"]["value"]
+        placerefs = data["placeref_list"]
+        parent_handle = placerefs[0]["ref"] if placerefs else None
+        if not name and parent_handle is None:
+            continue
+        place_cache.setdefault(((place_cache.name_key(name),), parent_handle), handle)
+        if data["lat"] and data["long"]:
+            place_cache.add_location(parent_handle, data["lat"], data["long"], handle)
+
+
 def _map_place_type(form_type: str) -> int:
     """Map a GEDCOM FORM type string to a Gramps PlaceType.
 
@@ -77,7 +273,7 @@ def handle_event(
     xref_handle_map: dict[str, str],
     event_type_map: dict[str, int],
     settings: ImportSettings,
-    place_cache: dict[tuple[tuple[str, ...], str | None], str],
+    place_cache: PlaceCache,
 ) -> tuple[Event, list[BasicPrimaryObject]]:
     """Convert a GEDCOM event structure to a Gramps Event object.
 
@@ -93,7 +289,7 @@ def handle_event(
     """
     event = Event()
     event.set_type(event_type_map.get(structure.tag, EventType.CUSTOM))
-    event.handle = util.make_handle()
+    event.handle = util.structure_handle(structure)
     objects = []
     for child in structure.children:
         if child.tag == g7const.TYPE:
@@ -102,7 +298,7 @@ def handle_event(
                 assert isinstance(
                     child.value, str
                 ), "Expected TYPE value to be a string"
-                event.set_type(EventType(child.value))
+                event.set_type(util.gramps_type(EventType, child.value))
         elif child.tag == g7const.RESN:
             util.set_privacy_on_object(resn_structure=child, obj=event)
         elif child.tag == g7const.PHON:
@@ -164,9 +360,10 @@ def handle_event(
                     g7types.DateRange,
                 ),
             ), "Expected value to be a date-related object"
-            date = util.gedcom_date_value_to_gramps_date(child.value)
+            assert child.text is not None
+            date = util.convert_date(child.text, child.value)
             # Handle PHRASE substructure
-            phrase_structure = g7util.get_first_child_with_tag(child, g7const.PHRASE)
+            phrase_structure = util.first_child(child, g7const.PHRASE)
             if phrase_structure and phrase_structure.value:
                 assert isinstance(
                     phrase_structure.value, str
@@ -174,7 +371,7 @@ def handle_event(
                 date.set_text_value(phrase_structure.value)
             event.set_date_object(date)
             # Handle TIME substructure
-            time_structure = g7util.get_first_child_with_tag(child, g7const.TIME)
+            time_structure = util.first_child(child, g7const.TIME)
             if time_structure and time_structure.value:
                 assert isinstance(
                     time_structure.value, g7types.Time
@@ -205,19 +402,34 @@ def _get_place_form(
 
     Returns PLAC.FORM if present, otherwise HEAD.PLAC.FORM from settings.
     """
-    form_struct = g7util.get_first_child_with_tag(structure, g7const.FORM)
+    form_struct = util.first_child(structure, g7const.FORM)
     if form_struct and form_struct.value:
         assert isinstance(form_struct.value, list), "Expected FORM value to be a list"
         return form_struct.value
     return settings.head_plac_form
 
 
+def _get_place_location(
+    structure: g7types.GedcomStructure,
+) -> tuple[str, str] | None:
+    """Get the latitude and longitude of a place structure from MAP, if any."""
+    map_struct = util.first_child(structure, g7const.MAP)
+    if map_struct is None:
+        return None
+    lat = util.first_child(map_struct, g7const.LATI)
+    lon = util.first_child(map_struct, g7const.LONG)
+    if lat is None or lon is None or not lat.text or not lon.text:
+        return None
+    return lat.text, lon.text
+
+
 def _create_hierarchy_place(
     jurisdiction_name: str,
     parent_handle: str | None,
     form_type: str | None,
-    place_cache: dict[tuple[tuple[str, ...], str | None], str],
+    place_cache: PlaceCache,
     place_objects: dict[str, Place],
+    location: tuple[str, str] | None = None,
 ) -> tuple[Place | None, str]:
     """Create or retrieve a single place in the hierarchy.
 
@@ -227,6 +439,7 @@ def _create_hierarchy_place(
         form_type: Type of this jurisdiction from FORM (e.g., "City", "State").
         place_cache: Cache for deduplication (maps cache_key to handle).
         place_objects: Dict mapping handles to Place objects (for newly created places only).
+        location: Latitude and longitude of the place from MAP, if any.
 
     Returns:
         Tuple of (Place object if newly created else None, handle of this place).
@@ -236,7 +449,7 @@ def _create_hierarchy_place(
         created by a previous event and already added to the database. Properties
         are only applied to newly created places (first-event-wins for deduplication).
     """
-    cache_key = ((jurisdiction_name,), parent_handle)
+    cache_key = ((place_cache.name_key(jurisdiction_name),), parent_handle)
 
     # Check if this place already exists (created by a previous event)
     if cache_key in place_cache:
@@ -244,11 +457,22 @@ def _create_hierarchy_place(
         # from the first event that created it
         return None, place_cache[cache_key]
 
+    # Merge into a nearby place with the same parent, e.g. a different spelling,
+    # and remember the name so that events without MAP find the place as well
+    if location is not None:
+        nearby_handle = place_cache.find_nearby(parent_handle, *location)
+        if nearby_handle is not None:
+            place_cache[cache_key] = nearby_handle
+            return None, nearby_handle
+
     # Create new place
     place = Place()
-    place.handle = util.make_handle()
+    # content-addressed, so equal places get equal handles in any file
+    place.handle = util.make_handle(f"PLAC/{parent_handle}/{cache_key[0][0]}")
     place_cache[cache_key] = place.handle
     place_objects[place.handle] = place
+    if location is not None:
+        place_cache.add_location(parent_handle, *location, place.handle)
 
     # Set the place name
     name = PlaceName()
@@ -258,7 +482,7 @@ def _create_hierarchy_place(
     # Set place type from FORM if available
     if form_type:
         place_type = _map_place_type(form_type)
-        place.set_type(PlaceType(place_type))
+        place.set_type(util.gramps_type(PlaceType, place_type))
 
     # Link to parent place if this is not the top level
     if parent_handle is not None:
@@ -281,13 +505,15 @@ def _apply_place_properties(
     """
     for child in structure.children:
         if child.tag == g7const.MAP:
-            lat = g7util.get_first_child_with_tag(child, g7const.LATI)
-            lon = g7util.get_first_child_with_tag(child, g7const.LONG)
+            lat = util.first_child(child, g7const.LATI)
+            lon = util.first_child(child, g7const.LONG)
             if lat is not None and lon is not None:
-                if not isinstance(lat.value, str) or not isinstance(lon.value, str):
+                # the parser converts the values to numbers, Gramps keeps
+                # the GEDCOM notation like N18.150944
+                if not isinstance(lat.text, str) or not isinstance(lon.text, str):
                     raise ValueError("Latitude and longitude must be strings")
-                place.set_latitude(lat.value)
-                place.set_longitude(lon.value)
+                place.set_latitude(lat.text)
+                place.set_longitude(lon.text)
         elif child.tag == g7const.LANG and child.value:
             place.name.set_language(child.value)
         elif child.tag == g7const.TRAN:
@@ -299,7 +525,7 @@ def _apply_place_properties(
             ), "Expected place name value list to be non-empty"
             alt_name = PlaceName()
             alt_name.set_value(child.value[0])
-            if lang := g7util.get_first_child_with_tag(child, g7const.LANG):
+            if lang := util.first_child(child, g7const.LANG):
                 alt_name.set_language(lang.value)
             place.add_alternative_name(alt_name)
         elif child.tag == g7const.SNOTE and child.pointer != g7grammar.voidptr:
@@ -315,9 +541,7 @@ def _apply_place_properties(
             assert isinstance(child.value, str), "Expected EXID value to be a string"
             url = Url()
             url.set_type(UrlType.CUSTOM)
-            type_child = next(
-                (c for c in child.children if c.tag == g7const.TYPE), None
-            )
+            type_child = util.first_child(child, g7const.TYPE)
             if type_child and type_child.value:
                 if isinstance(type_child.value, str) and type_child.value.startswith(
                     "http"
@@ -342,7 +566,7 @@ def handle_place(
     structure: g7types.GedcomStructure,
     xref_handle_map: dict[str, str],
     settings: ImportSettings,
-    place_cache: dict[tuple[tuple[str, ...], str | None], str],
+    place_cache: PlaceCache,
 ) -> tuple[str, list[BasicPrimaryObject]]:
     """Convert a GEDCOM place structure to a Gramps Place object with full hierarchy.
 
@@ -376,7 +600,7 @@ def handle_place(
         # place structures with different properties (coordinates, notes, etc.)
         # but no jurisdiction list - these should remain separate places
         place = Place()
-        place.handle = util.make_handle()
+        place.handle = util.structure_handle(structure)
         name = PlaceName()
         name.set_value("")
         place.set_name(name)
@@ -387,19 +611,34 @@ def handle_place(
     # Get FORM list for place types
     form_list = _get_place_form(structure, settings)
 
+    # All levels of a memoized jurisdiction list are cached, so the lowest
+    # place was created by a previous event and there is nothing to add
+    path_key = (tuple(jurisdiction_list), tuple(form_list) if form_list else None)
+    handle = place_cache.get_path(path_key)
+    if handle is not None:
+        return handle, []
+
     # Build hierarchy from highest (last) to lowest (first) jurisdiction
     # Track place objects so we can retrieve cached places
     objects: list[BasicPrimaryObject] = []
     place_objects: dict[str, Place] = {}
     parent_handle = None
 
+    # Only the lowest place gets the coordinates
+    location = _get_place_location(structure)
+
     # Process from highest level (end of list) to lowest (beginning)
     for i in range(len(jurisdiction_list) - 1, -1, -1):
         jurisdiction_name = jurisdiction_list[i]
         form_type = form_list[i] if form_list and i < len(form_list) else None
 
         new_place, place_handle = _create_hierarchy_place(
-            jurisdiction_name, parent_handle, form_type, place_cache, place_objects
+            jurisdiction_name,
+            parent_handle,
+            form_type,
+            place_cache,
+            place_objects,
+            location=location if i == 0 else None,
         )
 
         if new_place:
@@ -411,6 +650,7 @@ def handle_place(
     # parent_handle is guaranteed to be non-None here because jurisdiction_list is non-empty
     assert parent_handle is not None
     lowest_place = place_objects.get(parent_handle)
+    place_cache.paths[path_key] = parent_handle
 
     # Apply properties only to newly created places (first-event-wins)
     # If lowest_place is None, it means the place was cached from a previous event,
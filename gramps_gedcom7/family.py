@@ -5,7 +5,6 @@ from typing import List
 from gedcom7 import const as g7const
 from gedcom7 import grammar as g7grammar
 from gedcom7 import types as g7types
-from gedcom7 import util as g7util
 from gramps.gen.lib import (
     ChildRef,
     Family,
@@ -18,7 +17,7 @@ from gramps.gen.lib.primaryobj import BasicPrimaryObject
 
 from . import util
 from .citation import handle_citation
-from .event import handle_event
+from .event import PlaceCache, handle_event
 from .settings import ImportSettings
 
 EVENT_TYPE_MAP = {
@@ -40,7 +39,7 @@ def handle_family(
     structure: g7types.GedcomStructure,
     xref_handle_map: dict[str, str],
     settings: ImportSettings,
-    place_cache: dict[tuple[tuple[str, ...], str | None], str],
+    place_cache: PlaceCache,
 ) -> List[BasicPrimaryObject]:
     """Handle an family record and convert it to Gramps objects.
 
@@ -66,7 +65,7 @@ def handle_family(
                 raise ValueError(f"Person {child.pointer} not found")
             family.set_father_handle(person_handle)
             # Handle HUSB PHRASE - add to Family
-            phrase_structure = g7util.get_first_child_with_tag(child, g7const.PHRASE)
+            phrase_structure = util.first_child(child, g7const.PHRASE)
             if phrase_structure and phrase_structure.value:
                 family, note = util.add_note_to_object(phrase_structure, family)
                 objects.append(note)
@@ -76,7 +75,7 @@ def handle_family(
                 raise ValueError(f"Person {child.pointer} not found")
             family.set_mother_handle(person_handle)
             # Handle WIFE PHRASE - add to Family
-            phrase_structure = g7util.get_first_child_with_tag(child, g7const.PHRASE)
+            phrase_structure = util.first_child(child, g7const.PHRASE)
             if phrase_structure and phrase_structure.value:
                 family, note = util.add_note_to_object(phrase_structure, family)
                 objects.append(note)
@@ -88,7 +87,7 @@ def handle_family(
             child_ref.ref = person_handle
             family.add_child_ref(child_ref)
             # Handle CHIL PHRASE - add to ChildRef
-            phrase_structure = g7util.get_first_child_with_tag(child, g7const.PHRASE)
+            phrase_structure = util.first_child(child, g7const.PHRASE)
             if phrase_structure and phrase_structure.value:
                 assert isinstance(
                     phrase_structure.value, str
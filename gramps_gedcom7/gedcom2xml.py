@@ -3,6 +3,8 @@
 import click
 import gi
 from gramps_gedcom7.importer import import_gedcom
+from gramps_gedcom7.profiling import format_profile
+from gramps_gedcom7.settings import ImportSettings
 from gramps.gen.db.utils import make_database
 from gramps.gen.db import DbWriteBase
 from gramps.cli.user import User
@@ -20,17 +22,27 @@ gi.require_version("Gtk", "3.0")
     "output_file",
     type=click.Path(dir_okay=False, writable=True, resolve_path=True, allow_dash=True),
 )
-def main(input_file: str, output_file: str) -> None:
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Print the time and memory spent in each record handler to stderr.",
+)
+def main(input_file: str, output_file: str, profile: bool = False) -> None:
     """Convert a GEDCOM file to Gramps XML format.
 
     Args:
         input_file: Path to the input GEDCOM file.
         output_file: Path to the output XML file.
+        profile: Whether to profile the record handlers.
     """
     db: DbWriteBase = make_database("sqlite")
     db.load(":memory:", callback=None)
     user = User()
-    import_gedcom(input_file=input_file, db=db)
+    report = import_gedcom(
+        input_file=input_file, db=db, settings=ImportSettings(profile=profile)
+    )
+    if profile:
+        click.echo(format_profile(report.profile), err=True)
     export_data(database=db, filename=output_file, user=user)
 
 
@@ -1,9 +1,9 @@
 """Handle GEDCOM header records and import them into the Gramps database."""
 
 from gedcom7 import const as g7const
-from gedcom7 import util as g7util
 from gramps.gen.db import DbWriteBase
 from gedcom7 import types as g7types
+from . import util
 from .settings import ImportSettings
 
 
@@ -21,15 +21,15 @@ def handle_header(
         The XREF of the submitter referenced in HEAD.SUBM, or None.
     """
     # Extract HEAD.PLAC.FORM if present
-    plac_struct = g7util.get_first_child_with_tag(structure, g7const.PLAC)
+    plac_struct = util.first_child(structure, g7const.PLAC)
     if plac_struct:
-        form_struct = g7util.get_first_child_with_tag(plac_struct, g7const.FORM)
+        form_struct = util.first_child(plac_struct, g7const.FORM)
         if form_struct and form_struct.value:
             assert isinstance(form_struct.value, list), "Expected FORM value to be a list"
             settings.head_plac_form = form_struct.value
     
     # Extract SUBM reference from header
-    subm_struct = g7util.get_first_child_with_tag(structure, g7const.SUBM)
+    subm_struct = util.first_child(structure, g7const.SUBM)
     if subm_struct and subm_struct.pointer:
         return subm_struct.pointer
     return None
@@ -4,10 +4,14 @@ from __future__ import annotations
 
 from gramps.gen.db import DbWriteBase
 import gedcom7
+import os
+import time
 from pathlib import Path
-from typing import TextIO, BinaryIO
+from typing import TextIO, BinaryIO, Iterable, Iterator
 
-from . import process
+from . import process, reader
+from .progress import Progress, ProgressCallback, make_progress
+from .report import ImportReport
 from .settings import ImportSettings
 
 
@@ -15,26 +19,149 @@ def import_gedcom(
     input_file: str | Path | TextIO | BinaryIO,
     db: DbWriteBase,
     settings: ImportSettings = ImportSettings(),
-) -> None:
+    workers: int = 1,
+    progress: ProgressCallback | None = None,
+) -> ImportReport:
     """Import a GEDCOM file into a Gramps database.
 
     Args:
 
         input_file: The GEDCOM file to import. This can be a string, Path object, or file-like object.
         db: The Gramps database to import the GEDCOM file into.
+        workers: Number of worker processes converting the GEDCOM records into
+            Gramps objects. If 1, the records are converted in the current process.
+        progress: Called with the stage, the amount done and the total amount,
+            if known: bytes while reading and parsing, records while converting
+            and objects while writing. Calls are rate-limited. With the
+            pipeline setting, parse updates come from a background thread.
+
+    Returns:
+        A report with the time spent in each stage of the import and the
+        numbers of records and objects.
     """
+    report = ImportReport()
+    progress = make_progress(progress)
+    start = time.perf_counter()
+    if settings.streaming:
+        _import_gedcom_streaming(
+            input_file,
+            db,
+            settings=settings,
+            workers=workers,
+            report=report,
+            progress=progress,
+        )
+        report.total_seconds = time.perf_counter() - start
+        return report
+
+    size = _input_size(input_file)
     # Check if input_file is a string or Path object
+    with report.timer("read"):
+        if isinstance(input_file, (str, Path)):
+            gedcom_data: str = _read_file(input_file, progress, size)
+        elif isinstance(input_file, TextIO):
+            gedcom_data = input_file.read()
+        elif isinstance(input_file, BinaryIO):
+            gedcom_data = input_file.read().decode("utf-8")
+        else:
+            raise TypeError(
+                "input_file must be a string, Path object, or file-like object."
+            )
+    progress("read", size or 0, size, force=True)
+
+    with report.timer("parse"):
+        progress("parse", 0, size, force=True)
+        gedcom_structures = gedcom7.loads(gedcom_data)
+        progress("parse", size or 0, size, force=True)
+    process.process_gedcom_structures(
+        gedcom_structures,
+        db,
+        settings=settings,
+        workers=workers,
+        report=report,
+        progress=progress,
+    )
+    report.total_seconds = time.perf_counter() - start
+    return report
+
+
+def _input_size(input_file: str | Path | TextIO | BinaryIO) -> int | None:
+    """Get the size of the input from the current position, if it is known."""
     if isinstance(input_file, (str, Path)):
-        with open(input_file, "r", encoding="utf-8") as f:
-            gedcom_data: str = f.read()
-    elif isinstance(input_file, TextIO):
-        gedcom_data = input_file.read()
-    elif isinstance(input_file, BinaryIO):
-        gedcom_data = input_file.read().decode("utf-8")
-    else:
-        raise TypeError(
-            "input_file must be a string, Path object, or file-like object."
+        return os.path.getsize(input_file)
+    try:
+        position = input_file.tell()
+        end = input_file.seek(0, os.SEEK_END)
+        input_file.seek(position)
+    except (AttributeError, OSError, ValueError):
+        return None
+    return end - position
+
+
+def _read_file(path: str | Path, progress: Progress, size: int | None) -> str:
+    """Read a UTF-8 file in chunks, reporting the number of bytes read."""
+    chunks = []
+    done = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(reader.CHUNK_SIZE):
+            chunks.append(chunk)
+            done += len(chunk)
+            progress("read", done, size)
+    return b"".join(chunks).decode("utf-8")
+
+
+def _count_bytes(
+    lines: Iterable[str], progress: Progress, size: int | None
+) -> Iterator[str]:
+    """Pass lines through, reporting the number of bytes parsed so far."""
+    done = 0
+    for line in lines:
+        done += len(line) if line.isascii() else len(line.encode("utf-8"))
+        progress("parse", done, size)
+        yield line
+    progress("parse", size or done, size, force=True)
+
+
+def _import_gedcom_streaming(
+    input_file: str | Path | TextIO | BinaryIO,
+    db: DbWriteBase,
+    settings: ImportSettings,
+    report: ImportReport,
+    progress: Progress,
+    workers: int = 1,
+) -> None:
+    """Import a GEDCOM file record by record without loading it as a whole.
+
+    Reading and parsing are interleaved, so both count as the parse stage.
+    The read progress is reported by the first pass that scans for XREFs.
+    """
+    start = None if isinstance(input_file, (str, Path)) else input_file.tell()
+    size = _input_size(input_file)
+
+    # First pass: only scan the level-0 lines for XREFs
+    with report.timer("xref_map"):
+        xref_tags = reader.scan_xrefs(
+            input_file, progress=lambda done: progress("read", done, size)
+        )
+        progress("read", size or 0, size, force=True)
+        xref_handle_map = process.make_xref_handle_map(
+            xref_tags, namespace=settings.handle_namespace
         )
 
-    gedcom_structures = gedcom7.loads(gedcom_data)
-    process.process_gedcom_structures(gedcom_structures, db, settings=settings)
+    if start is not None:
+        assert not isinstance(input_file, (str, Path))
+        input_file.seek(start)
+
+    # Second pass: convert and add the records
+    with reader.open_lines(input_file) as lines:
+        process.process_gedcom_records(
+            report.iterate(
+                "parse", reader.iter_records(_count_bytes(lines, progress, size))
+            ),
+            db,
+            settings=settings,
+            xref_handle_map=xref_handle_map,
+            workers=workers,
+            report=report,
+            progress=progress,
+        )
@@ -0,0 +1,338 @@
+"""Re-import only the records of a GEDCOM file that changed since the last import."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Iterable, Iterator
+
+from gedcom7 import const as g7const
+from gedcom7 import types as g7types
+from gramps.gen.db import DbTxn, DbWriteBase
+from gramps.gen.errors import HandleError
+from gramps.gen.lib.primaryobj import BasicPrimaryObject
+
+from .event import PlaceCache
+
+# Tables holding the state of the last import, next to the Gramps tables
+RECORD_TABLE = "gedcom7_record"
+OBJECT_TABLE = "gedcom7_object"
+PLACE_TABLE = "gedcom7_place"
+PLACE_OBJECT_TABLE = "gedcom7_place_object"
+
+# Key of the header in the record table; XREFs always start with "@"
+HEADER_KEY = "HEAD"
+
+SCHEMA = [
+    f"CREATE TABLE IF NOT EXISTS {RECORD_TABLE} "
+    "(xref TEXT PRIMARY KEY, hash TEXT, handle TEXT)",
+    f"CREATE TABLE IF NOT EXISTS {OBJECT_TABLE} "
+    "(xref TEXT, obj_class TEXT, handle TEXT)",
+    f"CREATE INDEX IF NOT EXISTS {OBJECT_TABLE}_xref ON {OBJECT_TABLE} (xref)",
+    f"CREATE TABLE IF NOT EXISTS {PLACE_TABLE} "
+    "(names TEXT, parent_handle TEXT, handle TEXT)",
+    f"CREATE INDEX IF NOT EXISTS {PLACE_TABLE}_handle ON {PLACE_TABLE} (handle)",
+    f"CREATE TABLE IF NOT EXISTS {PLACE_OBJECT_TABLE} "
+    "(place_handle TEXT, obj_class TEXT, handle TEXT)",
+    f"CREATE INDEX IF NOT EXISTS {PLACE_OBJECT_TABLE}_place_handle "
+    f"ON {PLACE_OBJECT_TABLE} (place_handle)",
+]
+
+# Functions removing an object from the database, by class name
+REMOVE_METHODS = {
+    "Person": "remove_person",
+    "Family": "remove_family",
+    "Event": "remove_event",
+    "Citation": "remove_citation",
+    "Source": "remove_source",
+    "Note": "remove_note",
+    "Media": "remove_media",
+    "Place": "remove_place",
+    "Repository": "remove_repository",
+}
+
+
+def record_hash(structure: g7types.GedcomStructure) -> str:
+    """Hash the canonical form of a GEDCOM structure and its substructures.
+
+    The canonical form consists of the level, XREF, tag, pointer and text of
+    each line, so it does not depend on line endings or on how long texts
+    are split into CONT lines.
+    """
+    digest = hashlib.sha256()
+    stack = [(0, structure)]
+    while stack:
+        level, current = stack.pop()
+        digest.update(
+            "\x1f".join(
+                [
+                    str(level),
+                    current.xref or "",
+                    current.tag,
+                    current.pointer or "",
+                    current.text or "",
+                ]
+            ).encode("utf-8")
+            + b"\n"
+        )
+        stack.extend((level + 1, child) for child in reversed(current.children))
+    return digest.hexdigest()
+
+
+def _cached_place_key(
+    obj: BasicPrimaryObject,
+    place_cache: PlaceCache,
+) -> tuple[tuple[str, ...], str | None] | None:
+    """Get the key of a place shared through the place cache, or None."""
+    if obj.__class__.__name__ != "Place":
+        return None
+    placerefs = obj.get_placeref_list()
+    parent_handle = placerefs[0].ref if placerefs else None
+    key = ((place_cache.name_key(obj.get_name().get_value()),), parent_handle)
+    return key if place_cache.get(key) == obj.handle else None
+
+
+class IncrementalImport:
+    """Track which records of a GEDCOM file changed since the last import.
+
+    The hash of each level-0 record and the objects created from it are
+    stored in tables of the database, next to the Gramps tables. On the next
+    import, unchanged records are skipped before they are converted, the
+    objects of changed records are replaced, and the objects of records that
+    disappeared are removed. The rows of a record are written in the
+    transaction that writes its objects, so an aborted import leaves the
+    state consistent with the database, and only the rows of changed records
+    are written.
+
+    Record handles and places are kept stable across imports, so objects of
+    unchanged records keep referring to the right objects. Places are shared
+    between records and are not owned by any of them: a cached place is kept
+    with its properties until no event or place refers to it anymore. The
+    inline notes of a cached place belong to the place and are removed with
+    it.
+
+    Args:
+        db: The Gramps database that is imported into. Must use a DB-API
+            backend, such as SQLite.
+        header: The HEAD structure of the file. If it changed since the last
+            import, all records are treated as changed.
+    """
+
+    def __init__(self, db: DbWriteBase, header: g7types.GedcomStructure):
+        if not hasattr(db, "dbapi"):
+            raise ValueError(
+                "An incremental import requires a DB-API backend, "
+                f"got {db.__class__.__name__}"
+            )
+        self.db = db
+        for statement in SCHEMA:
+            db.dbapi.execute(statement)
+        db.dbapi.commit()
+        db.dbapi.execute(f"SELECT xref, hash, handle FROM {RECORD_TABLE}")
+        self.previous_records: dict[str, tuple[str, str | None]] = {
+            xref: (hash_, handle) for xref, hash_, handle in db.dbapi.fetchall()
+        }
+        db.dbapi.execute(f"SELECT names, parent_handle, handle FROM {PLACE_TABLE}")
+        self.stored_places: dict[tuple[tuple[str, ...], str | None], str] = {
+            (tuple(json.loads(names)), parent_handle or None): handle
+            for names, parent_handle, handle in db.dbapi.fetchall()
+        }
+        self.header_hash = record_hash(header)
+        previous_header = self.previous_records.pop(HEADER_KEY, None)
+        self.header_changed = (
+            previous_header is None or previous_header[0] != self.header_hash
+        )
+        self.xref_handle_map: dict[str, str] = {}
+        self.hashes: dict[str, str] = {}
+        self.place_candidates: set[str] = set()
+
+    def restore(
+        self,
+        xref_handle_map: dict[str, str],
+        place_cache: PlaceCache,
+    ) -> None:
+        """Reuse the handles of records and places of the last import."""
+        for xref in xref_handle_map:
+            previous = self.previous_records.get(xref)
+            if previous is not None and previous[1]:
+                xref_handle_map[xref] = previous[1]
+        self.xref_handle_map = xref_handle_map
+        for key, handle in self.stored_places.items():
+            place_cache[key] = handle
+
+    def changed_records(
+        self, records: Iterable[g7types.GedcomStructure]
+    ) -> Iterator[g7types.GedcomStructure]:
+        """Filter out the records that did not change since the last import."""
+        for structure in records:
+            if structure.xref and structure.tag != g7const.HEAD:
+                hash_ = record_hash(structure)
+                self.hashes[structure.xref] = hash_
+                previous = self.previous_records.get(structure.xref)
+                if (
+                    not self.header_changed
+                    and previous is not None
+                    and previous[0] == hash_
+                ):
+                    continue
+            yield structure
+
+    def replace_record(
+        self,
+        structure: g7types.GedcomStructure,
+        objects: list[BasicPrimaryObject],
+        transaction: DbTxn,
+        place_cache: PlaceCache,
+    ) -> None:
+        """Remove the objects of a record's last import and store the new ones.
+
+        Must be called before the new objects are added to the database, in
+        the same transaction.
+        """
+        xref = structure.xref
+        if not xref or xref not in self.hashes:
+            return
+        if xref in self.previous_records:
+            self._remove_record(xref, transaction)
+        self.db.dbapi.execute(
+            f"INSERT INTO {RECORD_TABLE} (xref, hash, handle) VALUES (?, ?, ?)",
+            [xref, self.hashes[xref], self.xref_handle_map.get(xref)],
+        )
+        cached_places = set()
+        # the inline notes of a cached place belong to the place, not the record
+        place_notes: dict[str, str] = {}
+        for obj in objects:
+            place_key = _cached_place_key(obj, place_cache)
+            if place_key is not None:
+                self._store_place(place_key, obj.handle)
+                cached_places.add(obj.handle)
+                place_notes.update(dict.fromkeys(obj.get_note_list(), obj.handle))
+        for obj in objects:
+            if obj.handle in cached_places:
+                continue
+            if obj.handle in place_notes:
+                self.db.dbapi.execute(
+                    f"INSERT INTO {PLACE_OBJECT_TABLE} "
+                    "(place_handle, obj_class, handle) VALUES (?, ?, ?)",
+                    [place_notes[obj.handle], obj.__class__.__name__, obj.handle],
+                )
+            else:
+                self.db.dbapi.execute(
+                    f"INSERT INTO {OBJECT_TABLE} (xref, obj_class, handle) "
+                    "VALUES (?, ?, ?)",
+                    [xref, obj.__class__.__name__, obj.handle],
+                )
+
+    def finish(
+        self,
+        transaction: DbTxn,
+        place_cache: PlaceCache,
+    ) -> None:
+        """Remove the objects of deleted records and store the remaining state."""
+        for xref in self.previous_records:
+            if xref not in self.hashes:
+                self._remove_record(xref, transaction)
+        self._remove_orphan_places(transaction, place_cache)
+        # names merged into other places and places reused from the database
+        for key, handle in place_cache.items():
+            if self.stored_places.get(key) != handle:
+                self._store_place(key, handle)
+        self.db.dbapi.execute(
+            f"DELETE FROM {RECORD_TABLE} WHERE xref = ?", [HEADER_KEY]
+        )
+        self.db.dbapi.execute(
+            f"INSERT INTO {RECORD_TABLE} (xref, hash, handle) VALUES (?, ?, ?)",
+            [HEADER_KEY, self.header_hash, None],
+        )
+
+    def _store_place(
+        self, key: tuple[tuple[str, ...], str | None], handle: str
+    ) -> None:
+        """Store a key of the place cache."""
+        # top-level places are stored with an empty parent handle
+        names, parent_handle = json.dumps(list(key[0])), key[1] or ""
+        if key in self.stored_places:
+            self.db.dbapi.execute(
+                f"DELETE FROM {PLACE_TABLE} WHERE names = ? AND parent_handle = ?",
+                [names, parent_handle],
+            )
+        self.db.dbapi.execute(
+            f"INSERT INTO {PLACE_TABLE} (names, parent_handle, handle) "
+            "VALUES (?, ?, ?)",
+            [names, parent_handle, handle],
+        )
+        self.stored_places[key] = handle
+
+    def _remove_record(self, xref: str, transaction: DbTxn) -> None:
+        """Remove the objects of a record's last import and its stored state."""
+        self.db.dbapi.execute(
+            f"SELECT obj_class, handle FROM {OBJECT_TABLE} WHERE xref = ?", [xref]
+        )
+        self._remove_objects(self.db.dbapi.fetchall(), transaction)
+        self.db.dbapi.execute(f"DELETE FROM {OBJECT_TABLE} WHERE xref = ?", [xref])
+        self.db.dbapi.execute(f"DELETE FROM {RECORD_TABLE} WHERE xref = ?", [xref])
+
+    def _remove_objects(
+        self, owned: Iterable[tuple[str, str]], transaction: DbTxn
+    ) -> None:
+        """Remove objects from the database, remembering the places they used."""
+        for class_name, handle in owned:
+            try:
+                if class_name == "Event":
+                    event = self.db.get_event_from_handle(handle)
+                    if event.get_place_handle():
+                        self.place_candidates.add(event.get_place_handle())
+                elif class_name == "Person":
+                    person = self.db.get_person_from_handle(handle)
+                    self.db.genderStats.uncount_person(person)
+            except HandleError:
+                # removed from the database since the last import
+                continue
+            getattr(self.db, REMOVE_METHODS[class_name])(handle, transaction)
+
+    def _remove_orphan_places(
+        self,
+        transaction: DbTxn,
+        place_cache: PlaceCache,
+    ) -> None:
+        """Remove cached places that are no longer referred to, bottom-up.
+
+        The inline notes of a removed place are removed with it.
+        """
+        # several names may refer to the same place if places are merged
+        cache_keys: dict[str, list[tuple[tuple[str, ...], str | None]]] = {}
+        for key, handle in place_cache.items():
+            cache_keys.setdefault(handle, []).append(key)
+        candidates = self.place_candidates
+        while candidates:
+            handle = candidates.pop()
+            if handle not in cache_keys:
+                continue
+            if next(self.db.find_backlink_handles(handle), None) is not None:
+                continue
+            for key in cache_keys.pop(handle):
+                del place_cache[key]
+                self.stored_places.pop(key, None)
+            self.db.dbapi.execute(
+                f"DELETE FROM {PLACE_TABLE} WHERE handle = ?", [handle]
+            )
+            self.db.dbapi.execute(
+                f"SELECT obj_class, handle FROM {PLACE_OBJECT_TABLE} "
+                "WHERE place_handle = ?",
+                [handle],
+            )
+            owned = self.db.dbapi.fetchall()
+            self.db.dbapi.execute(
+                f"DELETE FROM {PLACE_OBJECT_TABLE} WHERE place_handle = ?", [handle]
+            )
+            try:
+                place = self.db.get_place_from_handle(handle)
+            except HandleError:
+                place = None
+            else:
+                self.db.remove_place(handle, transaction)
+            self._remove_objects(owned, transaction)
+            if place is not None:
+                candidates.update(
+                    placeref.ref for placeref in place.get_placeref_list()
+                )
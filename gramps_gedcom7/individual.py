@@ -17,7 +17,7 @@ from gramps.gen.lib import (
 from gramps.gen.lib.primaryobj import BasicPrimaryObject
 
 from . import util
-from .event import handle_event
+from .event import PlaceCache, handle_event
 from .citation import handle_citation
 from .settings import ImportSettings
 
@@ -66,7 +66,7 @@ def handle_individual(
     structure: g7types.GedcomStructure,
     xref_handle_map: dict[str, str],
     settings: ImportSettings,
-    place_cache: dict[tuple[tuple[str, ...], str | None], str],
+    place_cache: PlaceCache,
 ) -> List[BasicPrimaryObject]:
     """Handle an individual record and convert it to Gramps objects.
 
@@ -228,11 +228,7 @@ def handle_association_structure(
             role_value = child.value
             
             # Check for ROLE PHRASE substructure - use it if present as it's more descriptive
-            phrase_structure = None
-            for role_child in child.children:
-                if role_child.tag == g7const.PHRASE:
-                    phrase_structure = role_child
-                    break
+            phrase_structure = util.first_child(child, g7const.PHRASE)
             
             if phrase_structure and phrase_structure.value:
                 # Use PHRASE as relation (e.g., "Teacher" instead of "OTHER")
@@ -4,7 +4,6 @@ from typing import List
 
 from gedcom7 import const as g7const
 from gedcom7 import types as g7types
-from gedcom7 import util as g7util
 from gramps.gen.lib import Attribute, AttributeType, Media
 from gramps.gen.lib.primaryobj import BasicPrimaryObject
 
@@ -57,17 +56,17 @@ def handle_multimedia(
         elif child.tag == g7const.UID:
             util.add_uid_to_object(child, media)
     # TODO handle multiple files
-    file_structure = g7util.get_first_child_with_tag(structure, g7const.FILE)
+    file_structure = util.first_child(structure, g7const.FILE)
     assert file_structure is not None, "Multimedia structure must have a FILE tag"
     assert isinstance(file_structure.value, str), "Expected FILE value to be a string"
     media.set_path(file_structure.value.removeprefix("file://"))
-    form_structure = g7util.get_first_child_with_tag(file_structure, g7const.FORM)
+    form_structure = util.first_child(file_structure, g7const.FORM)
     assert form_structure is not None, "Multimedia file must have a FORM tag"
     assert isinstance(
         form_structure.value, g7types.MediaType
     ), "Expected FORM value to be a MediaType"
     media.set_mime_type(form_structure.value.media_type)
-    title = g7util.get_first_child_with_tag(file_structure, g7const.TITL)
+    title = util.first_child(file_structure, g7const.TITL)
     if title is not None:
         assert isinstance(title.value, str), "Expected TITL value to be a string"
         media.set_description(title.value)
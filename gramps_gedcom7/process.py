@@ -2,33 +2,77 @@
 
 from __future__ import annotations
 
+import contextlib
+import contextvars
+import functools
+import itertools
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, ContextManager, Generator, Iterable, Iterator, TypeVar
+
 from gedcom7 import const as g7const
 from gedcom7 import types as g7types
 from gramps.gen.db import DbTxn, DbWriteBase
+from gramps.gen.lib.primaryobj import BasicPrimaryObject
 
+from .bulk import bulk_writer
+from .dedup import InlineDeduplicator
+from .event import PlaceCache, preload_place_cache
 from .family import handle_family
 from .header import handle_header
+from .incremental import IncrementalImport
 from .individual import handle_individual
 from .multimedia import handle_multimedia
 from .note import handle_shared_note
+from .profiling import profile_handlers
+from .progress import ProgressCallback, make_progress
+from .report import ImportReport, SlowRecord
 from .repository import handle_repository
 from .settings import ImportSettings
 from .source import handle_source
 from .submitter import handle_submitter, submitter_to_researcher
-from .util import make_handle
+from .util import (
+    DateCache,
+    cached_dates,
+    handle_namespace,
+    indexed_structures,
+    make_handle,
+)
+
+LOG = logging.getLogger(__name__)
+
+# Number of objects per transaction of a streaming import without a batch size
+STREAMING_COMMIT_BATCH_SIZE = 1000
 
 
 def process_gedcom_structures(
     gedcom_structures: list[g7types.GedcomStructure],
     db: DbWriteBase,
     settings: ImportSettings,
-):
+    workers: int = 1,
+    report: ImportReport | None = None,
+    progress: ProgressCallback | None = None,
+) -> ImportReport:
     """Process GEDCOM structures and import them into the Gramps database.
 
     Args:
         gedcom_structures: The GEDCOM structures to process.
         db: The Gramps database to import the GEDCOM structures into.
+        workers: Number of worker processes converting the records.
+        report: The report to add timings and counters to. If None, a new
+            report is created.
+        progress: Called with the number of records converted and the number
+            of objects written, at a limited rate.
+
+    Returns:
+        The report with the timings and counters of the import.
     """
+    if report is None:
+        report = ImportReport()
     if len(gedcom_structures) < 2:
         raise ValueError("No GEDCOM structures to process.")
     first_structure = gedcom_structures[0]
@@ -42,48 +86,508 @@ def process_gedcom_structures(
             f"Last structure must be a TRLR structure, but got {last_structure.tag}"
         )
 
-    # Extract HEAD.SUBM reference
-    head_subm_xref = handle_header(first_structure, db, settings=settings)
+    with report.timer("xref_map"):
+        xref_handle_map = make_xref_handle_map(
+            (structure.xref for structure in gedcom_structures),
+            namespace=settings.handle_namespace,
+        )
+    return process_gedcom_records(
+        gedcom_structures,
+        db,
+        settings=settings,
+        xref_handle_map=xref_handle_map,
+        workers=workers,
+        report=report,
+        progress=progress,
+    )
+
+
+def make_xref_handle_map(
+    xrefs: Iterable[str | None], namespace: str | None = None
+) -> dict[str, str]:
+    """Create a map of GEDCOM XREFs to new Gramps handles.
 
-    # Create a map of handles to XREFs
+    Args:
+        xrefs: The XREFs of the level-0 records. Empty values are skipped.
+        namespace: If given, the handles are derived from it and the XREFs
+            instead of being random.
+    """
     xref_handle_map = {}
-    for structure in gedcom_structures:
-        if structure.xref and structure.xref not in xref_handle_map:
-            xref_handle_map[structure.xref] = make_handle()
+    with handle_namespace(namespace):
+        for xref in xrefs:
+            if xref and xref not in xref_handle_map:
+                xref_handle_map[xref] = make_handle(xref)
+    return xref_handle_map
+
+
+def process_gedcom_records(
+    records: Iterable[g7types.GedcomStructure],
+    db: DbWriteBase,
+    settings: ImportSettings,
+    xref_handle_map: dict[str, str],
+    workers: int = 1,
+    report: ImportReport | None = None,
+    progress: ProgressCallback | None = None,
+) -> ImportReport:
+    """Convert GEDCOM records one at a time and add them to the database.
+
+    Only the objects of the current record are held in memory, so this can
+    be fed from a generator that parses the data stream record by record.
+
+    Args:
+        records: The level-0 structures, starting with HEAD and ending with TRLR.
+        db: The Gramps database to import the GEDCOM structures into.
+        settings: Import settings controlling how GEDCOM data is imported.
+        xref_handle_map: Mapping from the XREFs of all records to Gramps handles.
+        workers: Number of worker processes converting the records. If 1,
+            the records are converted in the current process.
+        report: The report to add timings and counters to. If None, a new
+            report is created.
+        progress: Called with the number of records converted and the number
+            of objects written, at a limited rate. The total number of records
+            is estimated from the XREF map.
+
+    Returns:
+        The report with the timings and counters of the import.
+    """
+    if report is None:
+        report = ImportReport()
+    progress = make_progress(progress)
+    records_total = len(xref_handle_map)
+    records_done = 0
+    objects_done = 0
+    records = iter(records)
+    first_structure = next(records, None)
+    if first_structure is None:
+        raise ValueError("No GEDCOM structures to process.")
+    if first_structure.tag != g7const.HEAD:
+        raise ValueError(
+            f"First structure must be a HEAD structure, but got {first_structure.tag}"
+        )
+
+    # Extract HEAD.SUBM reference
+    head_subm_xref = handle_header(first_structure, db, settings=settings)
 
     # Create a place cache for deduplication
     # Maps ((jurisdiction_name,), parent_handle) -> place_handle
     # parent_handle is None for top-level places, otherwise the handle of the parent place
-    place_cache: dict[tuple[tuple[str, ...], str | None], str] = {}
+    place_cache = PlaceCache(
+        merge_distance=settings.place_merge_distance,
+        normalization=settings.place_name_normalization,
+    )
+    if settings.reuse_existing_places:
+        with report.timer("places"):
+            preload_place_cache(db, place_cache)
+    # the date cache of the serial conversion; workers have their own
+    date_cache = DateCache()
+
+    deduplicator = None
+    if settings.deduplicate_notes or settings.deduplicate_citations:
+        if settings.incremental:
+            raise ValueError(
+                "Inline objects cannot be deduplicated in an incremental import"
+            )
+        deduplicator = InlineDeduplicator(
+            shared_handles=set(xref_handle_map.values()),
+            notes=settings.deduplicate_notes,
+            citations=settings.deduplicate_citations,
+        )
 
-    # Handle the remaining structures (excluding header and trailer)
-    objects = []
-    for structure in gedcom_structures[1:-1]:
-        objects += (
-            handle_structure(
+    incremental = None
+    if settings.incremental:
+        incremental = IncrementalImport(db, first_structure)
+        incremental.restore(xref_handle_map, place_cache)
+        records = incremental.changed_records(records)
+
+    if settings.pipeline:
+        # parser stage
+        records = _run_in_thread(records)
+    if workers > 1:
+        converted = _convert_records_parallel(
+            records, xref_handle_map, settings, place_cache, report, workers=workers
+        )
+    else:
+        converted = _convert_records(
+            records, xref_handle_map, settings, place_cache, date_cache, report
+        )
+    if settings.pipeline:
+        # conversion stage; the database writer stage is the current thread
+        converted = _run_in_thread(converted)
+
+    # Handle the remaining structures (excluding header and trailer),
+    # committing one transaction per batch of objects
+    commit_batch_size = settings.commit_batch_size
+    if commit_batch_size is None and settings.streaming:
+        commit_batch_size = STREAMING_COMMIT_BATCH_SIZE
+    profiler = (
+        profile_handlers(report.profile)
+        if settings.profile
+        else contextlib.nullcontext()
+    )
+    with profiler, contextlib.closing(converted):
+        last_structure = None
+        exhausted = False
+        while last_structure is None and not exhausted:
+            with DbTxn("Add child to family", db) as transaction, _object_writer(
+                db, transaction, settings
+            ) as add_object:
+                batch_count = 0
+                for structure, objects in converted:
+                    if structure.tag == g7const.TRLR:
+                        last_structure = structure
+                        break
+                    with report.timer("write"):
+                        if deduplicator:
+                            objects = deduplicator.deduplicate(objects)
+                        if incremental:
+                            incremental.replace_record(
+                                structure, objects, transaction, place_cache
+                            )
+                        for obj in objects:
+                            add_object(obj)
+                    report.objects.update(obj.__class__.__name__ for obj in objects)
+                    records_done += 1
+                    objects_done += len(objects)
+                    progress("convert", records_done, max(records_total, records_done))
+                    progress("write", objects_done)
+                    batch_count += len(objects)
+                    if (
+                        head_subm_xref
+                        and structure.tag == g7const.SUBM
+                        and structure.xref == head_subm_xref
+                    ):
+                        researcher = submitter_to_researcher(structure)
+                        db.set_researcher(researcher)
+                    if commit_batch_size and batch_count >= commit_batch_size:
+                        break
+                else:
+                    exhausted = True
+                commit_start = time.perf_counter()
+            report.add_time("write", time.perf_counter() - commit_start)
+    if last_structure is None:
+        raise ValueError("Last structure must be a TRLR structure")
+    if incremental:
+        with report.timer("write"), DbTxn("Remove deleted records", db) as transaction:
+            incremental.finish(transaction, place_cache)
+    progress("convert", records_done, records_done, force=True)
+    progress("write", objects_done, objects_done, force=True)
+    report.place_cache_hits += place_cache.hits
+    report.place_cache_misses += place_cache.misses
+    report.date_cache_hits += date_cache.hits
+    report.date_cache_misses += date_cache.misses
+    if deduplicator:
+        report.deduplicated.update(deduplicator.replaced)
+    return report
+
+
+def _convert_records(
+    records: Iterable[g7types.GedcomStructure],
+    xref_handle_map: dict[str, str],
+    settings: ImportSettings,
+    place_cache: PlaceCache,
+    date_cache: DateCache,
+    report: ImportReport,
+) -> Generator[tuple[g7types.GedcomStructure, list[BasicPrimaryObject]], None, None]:
+    """Convert GEDCOM records one at a time, yielding each with its objects.
+
+    The date cache counts its hits and misses; the caller adds them to the
+    report.
+    """
+    for structure in records:
+        start = time.perf_counter()
+        with (
+            handle_namespace(settings.handle_namespace),
+            indexed_structures(),
+            cached_dates(date_cache),
+        ):
+            objects = handle_structure(
                 structure,
                 xref_handle_map=xref_handle_map,
                 settings=settings,
                 place_cache=place_cache,
             )
-            or []
+        if structure.tag != g7const.TRLR:
+            seconds = time.perf_counter() - start
+            report.add_conversion(structure.tag, seconds)
+            _track_slow_record(structure, seconds, settings, report)
+        yield structure, objects or []
+
+
+def _track_slow_record(
+    structure: g7types.GedcomStructure,
+    seconds: float,
+    settings: ImportSettings,
+    report: ImportReport,
+) -> None:
+    """Log a record above the slow record threshold and rank the slowest ones."""
+    threshold = settings.slow_record_threshold
+    above_threshold = threshold is not None and seconds > threshold
+    if not above_threshold and not report.is_among_slowest(
+        seconds, settings.slow_record_count
+    ):
+        return
+    record = SlowRecord(
+        xref=structure.xref,
+        tag=structure.tag,
+        substructures=_count_substructures(structure),
+        seconds=seconds,
+    )
+    if above_threshold:
+        LOG.warning(
+            "Slow record %s %s with %d substructures took %.3f s",
+            record.xref,
+            record.tag,
+            record.substructures,
+            record.seconds,
         )
+    report.add_slow_record(record, settings.slow_record_count)
+
+
+def _count_substructures(structure: g7types.GedcomStructure) -> int:
+    """Count the substructures of a structure at all levels."""
+    return sum(1 + _count_substructures(child) for child in structure.children)
+
 
-    if head_subm_xref:
-        for structure in gedcom_structures[1:-1]:
-            if structure.tag == g7const.SUBM and structure.xref == head_subm_xref:
-                researcher = submitter_to_researcher(structure)
-                db.set_researcher(researcher)
-                break
+T = TypeVar("T")
+
+# Maximum number of items waiting between two pipeline stages
+PIPELINE_QUEUE_SIZE = 256
+
+# Marks the end of the items put into a pipeline queue
+_DONE = object()
+
+
+def _run_in_thread(items: Iterable[T]) -> Generator[T, None, None]:
+    """Iterate over items on a background thread.
+
+    The items are handed over through a bounded queue, so the background
+    thread blocks once it is PIPELINE_QUEUE_SIZE items ahead. Exceptions
+    raised on the background thread are re-raised in the consumer. Closing
+    the generator stops the background thread. The background thread runs in
+    a copy of the context in which iteration starts, e.g. with its profile.
+    """
+    item_queue: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    stop = threading.Event()
 
-    add_objects_to_database(objects, db)
+    def put(entry: tuple) -> bool:
+        """Put an entry into the queue unless the consumer has stopped."""
+        while not stop.is_set():
+            try:
+                item_queue.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce() -> None:
+        iterator = iter(items)
+        error = None
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    return
+        except BaseException as exc:
+            error = exc
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+        put((_DONE, error))
+
+    context = contextvars.copy_context()
+    thread = threading.Thread(target=context.run, args=(produce,), daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = item_queue.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+# Number of records sent to a worker process at a time
+PARALLEL_CHUNK_SIZE = 500
+
+# State of a worker process, set once by _init_worker
+_worker_state: dict = {}
+
+
+def _init_worker(xref_handle_map: dict[str, str], settings: ImportSettings) -> None:
+    """Initialize a worker process with the state shared by all records."""
+    _worker_state["xref_handle_map"] = xref_handle_map
+    _worker_state["settings"] = settings
+    # dates are cached across the chunks converted by the worker
+    _worker_state["date_cache"] = DateCache()
+
+
+def _convert_chunk(
+    records: list[g7types.GedcomStructure],
+) -> tuple[
+    list[list[BasicPrimaryObject]],
+    PlaceCache,
+    ImportReport,
+]:
+    """Convert a chunk of records in a worker process.
+
+    Returns the objects of each record, the place cache of the chunk, which
+    the main process needs to reconcile the places, and the conversion report.
+    """
+    settings = _worker_state["settings"]
+    place_cache = PlaceCache(
+        merge_distance=settings.place_merge_distance,
+        normalization=settings.place_name_normalization,
+    )
+    date_cache = _worker_state["date_cache"]
+    date_cache_hits, date_cache_misses = date_cache.hits, date_cache.misses
+    report = ImportReport()
+    objects = [
+        objects
+        for _, objects in _convert_records(
+            records,
+            _worker_state["xref_handle_map"],
+            settings,
+            place_cache,
+            date_cache,
+            report,
+        )
+    ]
+    report.date_cache_hits = date_cache.hits - date_cache_hits
+    report.date_cache_misses = date_cache.misses - date_cache_misses
+    # the main process reconciles the places level by level
+    place_cache.paths.clear()
+    return objects, place_cache, report
+
+
+def _chunk_records(
+    records: Iterable[g7types.GedcomStructure], chunk_size: int
+) -> Iterator[list[g7types.GedcomStructure]]:
+    """Group records into chunks, ending a chunk at the trailer."""
+    chunk = []
+    for structure in records:
+        chunk.append(structure)
+        if len(chunk) >= chunk_size or structure.tag == g7const.TRLR:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _convert_records_parallel(
+    records: Iterable[g7types.GedcomStructure],
+    xref_handle_map: dict[str, str],
+    settings: ImportSettings,
+    place_cache: PlaceCache,
+    report: ImportReport,
+    workers: int,
+) -> Generator[tuple[g7types.GedcomStructure, list[BasicPrimaryObject]], None, None]:
+    """Convert GEDCOM records in a pool of worker processes.
+
+    Records are sent to the workers in chunks and the results are yielded in
+    the original order, with at most two chunks per worker in flight. Each
+    chunk is converted with its own place cache; the places are reconciled
+    with the global place cache in the main process. A place reused within a
+    chunk counts as a cache hit; the hits and misses of the reconciliation
+    are counted by the global place cache.
+    """
+    chunks = _chunk_records(records, PARALLEL_CHUNK_SIZE)
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(xref_handle_map, settings),
+    )
+    try:
+        pending: deque[tuple[list[g7types.GedcomStructure], Future]] = deque(
+            (chunk, executor.submit(_convert_chunk, chunk))
+            for chunk in itertools.islice(chunks, 2 * workers)
+        )
+        while pending:
+            chunk, future = pending.popleft()
+            objects_per_record, chunk_place_cache, chunk_report = future.result()
+            next_chunk = next(chunks, None)
+            if next_chunk is not None:
+                pending.append(
+                    (next_chunk, executor.submit(_convert_chunk, next_chunk))
+                )
+            _merge_places(objects_per_record, chunk_place_cache, place_cache)
+            report.merge_conversion(chunk_report, settings.slow_record_count)
+            report.place_cache_hits += chunk_place_cache.hits
+            yield from zip(chunk, objects_per_record)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _merge_places(
+    objects_per_record: list[list[BasicPrimaryObject]],
+    chunk_place_cache: PlaceCache,
+    place_cache: PlaceCache,
+) -> None:
+    """Reconcile the places of a chunk with the global place cache.
+
+    A place of the chunk that is already in the global cache, or is merged
+    into a nearby cached place, is dropped and references to it are
+    redirected to the cached place, as if the chunk had been converted with
+    the global cache. Places are created parent first, so a parent's handle
+    is always reconciled before its children's keys.
+    """
+    # the first key of a place is its own name, later ones are merged names
+    chunk_keys: dict[str, tuple[tuple[str, ...], str | None]] = {}
+    for key, handle in chunk_place_cache.items():
+        chunk_keys.setdefault(handle, key)
+    handle_map: dict[str, str] = {}
+    for objects in objects_per_record:
+        kept = []
+        for obj in objects:
+            if obj.__class__.__name__ == "Place" and obj.handle in chunk_keys:
+                names, parent_handle = chunk_keys[obj.handle]
+                if parent_handle is not None:
+                    parent_handle = handle_map.get(parent_handle, parent_handle)
+                key = (names, parent_handle)
+                if key in place_cache:
+                    handle_map[obj.handle] = place_cache[key]
+                    continue
+                if obj.get_latitude():
+                    nearby_handle = place_cache.find_nearby(
+                        parent_handle, obj.get_latitude(), obj.get_longitude()
+                    )
+                    if nearby_handle is not None:
+                        handle_map[obj.handle] = place_cache[key] = nearby_handle
+                        continue
+                    place_cache.add_location(
+                        parent_handle,
+                        obj.get_latitude(),
+                        obj.get_longitude(),
+                        obj.handle,
+                    )
+                place_cache[key] = obj.handle
+            kept.append(obj)
+        objects[:] = kept
+    # names merged into nearby places within the chunk
+    for (names, parent_handle), handle in chunk_place_cache.items():
+        if parent_handle is not None:
+            parent_handle = handle_map.get(parent_handle, parent_handle)
+        place_cache.setdefault((names, parent_handle), handle_map.get(handle, handle))
+    if not handle_map:
+        return
+    for objects in objects_per_record:
+        for obj in objects:
+            if obj.__class__.__name__ == "Event":
+                place_handle = obj.get_place_handle()
+                obj.set_place_handle(handle_map.get(place_handle, place_handle))
+            elif obj.__class__.__name__ == "Place":
+                for placeref in obj.get_placeref_list():
+                    placeref.ref = handle_map.get(placeref.ref, placeref.ref)
 
 
 def handle_structure(
     structure: g7types.GedcomStructure,
     xref_handle_map: dict[str, str],
     settings: ImportSettings,
-    place_cache: dict[tuple[tuple[str, ...], str | None], str],
+    place_cache: PlaceCache,
 ) -> list | None:
     """Handle a single GEDCOM structure and import it into the Gramps database.
 
@@ -130,26 +634,41 @@ def handle_structure(
     return None
 
 
+def _object_writer(
+    db: DbWriteBase, transaction: DbTxn, settings: ImportSettings
+) -> ContextManager[Callable[[BasicPrimaryObject], None]]:
+    """Get a context providing the function that adds an object to the database."""
+    if settings.bulk_write:
+        return bulk_writer(db, transaction, add_object_to_database)
+    return contextlib.nullcontext(
+        functools.partial(add_object_to_database, db=db, transaction=transaction)
+    )
+
+
 def add_objects_to_database(objects, db):
     with DbTxn("Add child to family", db) as transaction:
         for obj in objects:
-            if obj.__class__.__name__ == "Person":
-                db.add_person(obj, transaction)
-            elif obj.__class__.__name__ == "Family":
-                db.add_family(obj, transaction)
-            elif obj.__class__.__name__ == "Event":
-                db.add_event(obj, transaction)
-            elif obj.__class__.__name__ == "Citation":
-                db.add_citation(obj, transaction)
-            elif obj.__class__.__name__ == "Source":
-                db.add_source(obj, transaction)
-            elif obj.__class__.__name__ == "Note":
-                db.add_note(obj, transaction)
-            elif obj.__class__.__name__ == "Media":
-                db.add_media(obj, transaction)
-            elif obj.__class__.__name__ == "Place":
-                db.add_place(obj, transaction)
-            elif obj.__class__.__name__ == "Repository":
-                db.add_repository(obj, transaction)
-            elif obj.__class__.__name__ == "Tag":
-                db.add_tag(obj, transaction)
+            add_object_to_database(obj, db, transaction)
+
+
+def add_object_to_database(obj, db, transaction):
+    if obj.__class__.__name__ == "Person":
+        db.add_person(obj, transaction)
+    elif obj.__class__.__name__ == "Family":
+        db.add_family(obj, transaction)
+    elif obj.__class__.__name__ == "Event":
+        db.add_event(obj, transaction)
+    elif obj.__class__.__name__ == "Citation":
+        db.add_citation(obj, transaction)
+    elif obj.__class__.__name__ == "Source":
+        db.add_source(obj, transaction)
+    elif obj.__class__.__name__ == "Note":
+        db.add_note(obj, transaction)
+    elif obj.__class__.__name__ == "Media":
+        db.add_media(obj, transaction)
+    elif obj.__class__.__name__ == "Place":
+        db.add_place(obj, transaction)
+    elif obj.__class__.__name__ == "Repository":
+        db.add_repository(obj, transaction)
+    elif obj.__class__.__name__ == "Tag":
+        db.add_tag(obj, transaction)
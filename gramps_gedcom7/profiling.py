@@ -0,0 +1,171 @@
+"""Profile the time and memory spent in the GEDCOM record handlers."""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import importlib
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Callable, Iterator
+
+# Handlers to profile, by the module defining them
+HANDLERS = {
+    "process": ["handle_structure"],
+    "individual": [
+        "handle_individual",
+        "handle_name",
+        "handle_association_structure",
+        "handle_alias_structure",
+    ],
+    "family": ["handle_family"],
+    "event": ["handle_event", "handle_place"],
+    "citation": ["handle_citation"],
+    "source": ["handle_source"],
+    "note": ["handle_shared_note"],
+    "multimedia": ["handle_multimedia"],
+    "repository": ["handle_repository"],
+    "submitter": ["handle_submitter"],
+}
+
+
+@dataclass
+class HandlerStats:
+    """Cumulative statistics of a handler."""
+
+    calls: int = 0
+    """Number of calls."""
+
+    seconds: float = 0.0
+    """Wall time spent in the handler, including the handlers it calls."""
+
+    allocated: int = 0
+    """Net size in bytes of the memory allocated by the handler and not yet
+    freed when it returned, i.e. mostly the objects it created."""
+
+
+# Profile of the handlers called in the current context and whether to
+# measure their memory, set by profile_handlers
+_active_profile: contextvars.ContextVar[
+    tuple[dict[str, HandlerStats], bool] | None
+] = contextvars.ContextVar("active_profile", default=None)
+
+# The wrappers are installed once for all overlapping profile_handlers
+# contexts, which are counted, and removed when the last one exits
+_lock = threading.Lock()
+_installed: list[tuple[ModuleType, str, Callable]] = []
+_profiles = 0
+_memory_profiles = 0
+_started_tracing = False
+
+
+def _wrap(handler: Callable, name: str) -> Callable:
+    """Wrap a handler to add the time and memory of each call to the profile.
+
+    Calls outside of a profile_handlers context are passed through.
+    """
+
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        active = _active_profile.get()
+        if active is None:
+            return handler(*args, **kwargs)
+        profile, trace_memory = active
+        stats = profile.setdefault(name, HandlerStats())
+        memory_before = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+        start = time.perf_counter()
+        try:
+            return handler(*args, **kwargs)
+        finally:
+            stats.seconds += time.perf_counter() - start
+            stats.calls += 1
+            if trace_memory:
+                stats.allocated += tracemalloc.get_traced_memory()[0] - memory_before
+
+    return wrapper
+
+
+def _install_wrappers() -> None:
+    """Replace the handlers by wrappers in all modules that refer to them."""
+    modules = {
+        name: importlib.import_module(f"{__package__}.{name}") for name in HANDLERS
+    }
+    for module_name, handler_names in HANDLERS.items():
+        for name in handler_names:
+            handler: Callable = getattr(modules[module_name], name)
+            wrapper = _wrap(handler, name)
+            for module in modules.values():
+                if getattr(module, name, None) is handler:
+                    setattr(module, name, wrapper)
+                    _installed.append((module, name, handler))
+
+
+@contextlib.contextmanager
+def profile_handlers(
+    profile: dict[str, HandlerStats], trace_memory: bool = True
+) -> Iterator[None]:
+    """Profile the record handlers called in the current context.
+
+    The handlers are replaced by wrappers in all modules of the package that
+    refer to them while any profile_handlers context is active, so profiling
+    costs nothing otherwise. The wrappers only profile calls made in the
+    context, or in threads started with a copy of it, so concurrent imports
+    do not record each other's calls. Calls in worker processes are not
+    profiled.
+
+    Args:
+        profile: The statistics of each handler, by name. Updated in place.
+        trace_memory: Also measure the memory allocated by each handler with
+            tracemalloc. This slows down the import considerably. Memory
+            allocated by other threads in the meantime is included.
+    """
+    global _profiles, _memory_profiles, _started_tracing
+    with _lock:
+        if not _profiles:
+            _install_wrappers()
+        _profiles += 1
+        if trace_memory:
+            if not _memory_profiles and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _started_tracing = True
+            _memory_profiles += 1
+    for names in HANDLERS.values():
+        for name in names:
+            profile.setdefault(name, HandlerStats())
+    token = _active_profile.set((profile, trace_memory))
+    try:
+        yield
+    finally:
+        _active_profile.reset(token)
+        with _lock:
+            if trace_memory:
+                _memory_profiles -= 1
+                if not _memory_profiles and _started_tracing:
+                    tracemalloc.stop()
+                    _started_tracing = False
+            _profiles -= 1
+            if not _profiles:
+                for module, name, handler in reversed(_installed):
+                    setattr(module, name, handler)
+                _installed.clear()
+
+
+def format_profile(profile: dict[str, HandlerStats]) -> str:
+    """Format handler statistics as a table, slowest handler first."""
+    lines = [
+        f"{'handler':<30} {'calls':>9} {'cum. s':>9} {'µs/call':>9} {'net KiB':>10}"
+    ]
+    for name, stats in sorted(
+        profile.items(), key=lambda item: item[1].seconds, reverse=True
+    ):
+        if not stats.calls:
+            continue
+        lines.append(
+            f"{name:<30} {stats.calls:>9} {stats.seconds:>9.3f} "
+            f"{stats.seconds / stats.calls * 1e6:>9.1f} {stats.allocated / 1024:>10.1f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,66 @@
+"""Report the progress of an import."""
+
+from __future__ import annotations
+
+import math
+import time
+from typing import Callable, Optional
+
+ProgressCallback = Callable[[str, int, Optional[int]], None]
+"""Called with the stage, the amount done so far and the total, if known.
+
+The stages are ``read`` and ``parse``, counted in bytes of the input,
+``convert``, counted in level-0 records, and ``write``, counted in objects.
+"""
+
+# Minimum time between two calls for the same stage, in seconds
+MIN_INTERVAL = 0.1
+
+
+class Progress:
+    """Pass progress updates on to a callback at a limited rate.
+
+    Updates of a stage arriving less than ``min_interval`` seconds after the
+    last call for that stage are dropped, unless they are forced, so that
+    large imports do not pay for a callback on every record or object.
+
+    Args:
+        callback: The function to call, or None to drop all updates.
+        min_interval: Minimum time between two calls for the same stage.
+            Defaults to MIN_INTERVAL.
+    """
+
+    def __init__(
+        self, callback: ProgressCallback | None, min_interval: float | None = None
+    ):
+        self.callback = callback
+        self.min_interval = MIN_INTERVAL if min_interval is None else min_interval
+        self._last_call: dict[str, float] = {}
+
+    def __call__(
+        self, stage: str, done: int, total: int | None = None, force: bool = False
+    ) -> None:
+        """Report the progress of a stage.
+
+        Args:
+            stage: The stage of the import.
+            done: The amount done so far.
+            total: The total amount, if known.
+            force: Call the callback even if the last call was very recent,
+                e.g. for the final update of a stage.
+        """
+        if self.callback is None:
+            return
+        now = time.monotonic()
+        last_call = self._last_call.get(stage, -math.inf)
+        if not force and now - last_call < self.min_interval:
+            return
+        self._last_call[stage] = now
+        self.callback(stage, done, total)
+
+
+def make_progress(callback: ProgressCallback | None) -> Progress:
+    """Wrap a progress callback for rate-limited updates, unless it already is."""
+    if isinstance(callback, Progress):
+        return callback
+    return Progress(callback)
@@ -0,0 +1,188 @@
+"""Read GEDCOM 7 data streams one level-0 record at a time."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import re
+from pathlib import Path
+from typing import IO, AnyStr, BinaryIO, Callable, Iterable, Iterator, TextIO
+
+import gedcom7
+from gedcom7 import const as g7const
+from gedcom7 import types as g7types
+from gedcom7 import util as g7util
+
+# U+FEFF, the byte-order mark, may open a data stream and carries no meaning
+BOM = "\ufeff"
+
+TRAILER = "0 TRLR\n"
+
+# A level-0 line with a cross-reference identifier, e.g. "0 @I1@ INDI". A line
+# starts at the beginning of a chunk (chunks are cut after an EOL) or after an
+# EOL, which may be CR, LF or CR-LF.
+_XREF_LINE = r"(?:\A|(?<=[\r\n]))0 (@[A-Z0-9_]+@) (_?[A-Z0-9_]+)"
+_XREF_LINE_TEXT = re.compile(_XREF_LINE)
+_XREF_LINE_BYTES = re.compile(_XREF_LINE.encode("ascii"))
+
+CHUNK_SIZE = 1 << 20
+
+
+@contextlib.contextmanager
+def open_lines(
+    input_file: str | Path | TextIO | BinaryIO,
+) -> Iterator[Iterable[str]]:
+    """Open a GEDCOM file for reading it line by line.
+
+    Args:
+        input_file: The GEDCOM file. This can be a string, Path object, or file-like object.
+
+    Yields:
+        An iterable over the lines of the file. Line endings are not stripped.
+    """
+    if isinstance(input_file, (str, Path)):
+        with open(input_file, "r", encoding="utf-8") as f:
+            yield f
+    elif isinstance(input_file, io.TextIOBase):
+        yield input_file
+    elif isinstance(input_file, (io.BufferedIOBase, io.RawIOBase)):
+        wrapper = io.TextIOWrapper(input_file, encoding="utf-8")
+        try:
+            yield wrapper
+        finally:
+            # leave the caller's file object open
+            wrapper.detach()
+    else:
+        raise TypeError(
+            "input_file must be a string, Path object, or file-like object."
+        )
+
+
+def _iter_chunks(f: IO[AnyStr], cr: AnyStr, lf: AnyStr) -> Iterator[AnyStr]:
+    """Read a file in large chunks that each end right after an EOL.
+
+    Only the last chunk may lack a terminating EOL.
+    """
+    leftover = f.read(0)
+    while chunk := f.read(CHUNK_SIZE):
+        buffer = leftover + chunk
+        cut = max(buffer.rfind(cr), buffer.rfind(lf)) + 1
+        yield buffer[:cut]
+        leftover = buffer[cut:]
+    if leftover:
+        yield leftover
+
+
+def scan_xrefs(
+    input_file: str | Path | TextIO | BinaryIO,
+    progress: Callable[[int], None] | None = None,
+) -> dict[str, str]:
+    """Scan a GEDCOM file for the XREFs of its level-0 records.
+
+    Only level-0 lines are matched, with a regular expression over large raw
+    chunks of the file, and nothing is parsed. This runs close to the speed
+    at which the file can be read and needs memory only for the result.
+
+    File-like objects are read from their current position to the end.
+
+    Args:
+        input_file: The GEDCOM file. This can be a string, Path object, or file-like object.
+        progress: Called after each chunk with the amount scanned so far, in
+            bytes for binary input and in characters for text input.
+
+    Returns:
+        A dictionary mapping the XREF of each record to its tag, in file order.
+        For duplicate XREFs, the first record wins.
+    """
+    if isinstance(input_file, (str, Path)):
+        with open(input_file, "rb") as f:
+            return scan_xrefs(f, progress=progress)
+    xref_tags: dict[str, str] = {}
+    scanned = 0
+    if isinstance(input_file, io.TextIOBase):
+        for text_chunk in _iter_chunks(input_file, "\r", "\n"):
+            for text_match in _XREF_LINE_TEXT.finditer(text_chunk):
+                xref_tags.setdefault(*text_match.group(1, 2))
+            scanned += len(text_chunk)
+            if progress is not None:
+                progress(scanned)
+    elif isinstance(input_file, (io.BufferedIOBase, io.RawIOBase)):
+        for chunk in _iter_chunks(input_file, b"\r", b"\n"):
+            for match in _XREF_LINE_BYTES.finditer(chunk):
+                xref, tag = match.group(1, 2)
+                xref_tags.setdefault(xref.decode("ascii"), tag.decode("ascii"))
+            scanned += len(chunk)
+            if progress is not None:
+                progress(scanned)
+    else:
+        raise TypeError(
+            "input_file must be a string, Path object, or file-like object."
+        )
+    return xref_tags
+
+
+def iter_record_lines(lines: Iterable[str]) -> Iterator[list[str]]:
+    """Group the lines of a GEDCOM data stream by level-0 record.
+
+    Args:
+        lines: The lines of the data stream, with or without line endings.
+
+    Yields:
+        For each level-0 record, the list of its lines without line endings.
+    """
+    record: list[str] = []
+    first = True
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if first:
+            line = line.removeprefix(BOM)
+            first = False
+        if line.startswith("0 ") and record:
+            yield record
+            record = []
+        record.append(line)
+    if record:
+        yield record
+
+
+def _schema_prelude(header: g7types.GedcomStructure) -> str:
+    """Build a minimal header carrying only the extension schema of a dataset.
+
+    Prepending it to a single record lets the parser resolve documented
+    extension tags exactly as it would for the whole dataset.
+    """
+    lines = [f"0 {g7const.HEAD}"]
+    schema = g7util.get_first_child_with_tag(header, g7const.SCHMA)
+    if schema:
+        lines.append(f"1 {g7const.SCHMA}")
+        for child in schema.children:
+            if child.tag == g7const.TAG:
+                lines.append(f"2 {g7const.TAG} {child.text}")
+    return "\n".join(lines) + "\n"
+
+
+def iter_records(lines: Iterable[str]) -> Iterator[g7types.GedcomStructure]:
+    """Parse a GEDCOM data stream one level-0 record at a time.
+
+    Only a single record's lines and parse tree are held in memory at any
+    time, so memory use depends on the largest record rather than on the size
+    of the data stream.
+
+    Args:
+        lines: The lines of the data stream.
+
+    Yields:
+        The level-0 structures of the data stream, including HEAD and TRLR.
+    """
+    prelude: str | None = None
+    for record_lines in iter_record_lines(lines):
+        text = "\n".join(record_lines) + "\n"
+        if prelude is None:
+            # the first record is the header
+            header = gedcom7.loads(text + TRAILER)[0]
+            prelude = _schema_prelude(header)
+            yield header
+        elif record_lines[0] == f"0 {g7const.TRLR}":
+            yield gedcom7.loads(prelude + text)[-1]
+        else:
+            yield gedcom7.loads(prelude + text + TRAILER)[1]
@@ -0,0 +1,171 @@
+"""Timings and counters collected during an import."""
+
+from __future__ import annotations
+
+import contextlib
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field, fields
+from typing import Iterable, Iterator, TypeVar
+
+from .profiling import HandlerStats
+
+T = TypeVar("T")
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+@dataclass
+class SlowRecord:
+    """A level-0 record that was slow to convert."""
+
+    xref: str | None
+    """The XREF of the record."""
+
+    tag: str
+    """The tag of the record."""
+
+    substructures: int
+    """The number of substructures of the record, at all levels."""
+
+    seconds: float
+    """Time taken to convert the record."""
+
+
+@dataclass
+class ImportReport:
+    """Timings and counters of a GEDCOM import.
+
+    Stage times are wall times in seconds. With the pipeline or worker
+    processes, stages overlap, so their sum may exceed the total time.
+    """
+
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+    """Time spent in each stage: read, parse, xref_map, places, convert and write.
+
+    The places stage only occurs if existing places are reused.
+    """
+
+    conversion_seconds: dict[str, float] = field(default_factory=dict)
+    """Time spent converting level-0 records, by tag."""
+
+    records: Counter[str] = field(default_factory=Counter)
+    """Number of converted level-0 records, by tag."""
+
+    objects: Counter[str] = field(default_factory=Counter)
+    """Number of Gramps objects added to the database, by class name."""
+
+    place_cache_hits: int = 0
+    """Number of places that were found in the place cache and reused."""
+
+    place_cache_misses: int = 0
+    """Number of places that were not in the place cache and were created."""
+
+    date_cache_hits: int = 0
+    """Number of dates that were copied from the date cache."""
+
+    date_cache_misses: int = 0
+    """Number of dates that were not in the date cache and were converted."""
+
+    deduplicated: Counter[str] = field(default_factory=Counter)
+    """Number of inline objects replaced by an identical one, by class name."""
+
+    total_seconds: float = 0.0
+    """Wall time of the whole import."""
+
+    profile: dict[str, HandlerStats] = field(default_factory=dict)
+    """Statistics of each record handler, if the import was profiled."""
+
+    slowest_records: list[SlowRecord] = field(default_factory=list)
+    """The records that took longest to convert, slowest first."""
+
+    @contextlib.contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """Add the time spent in the context to a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - start)
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        """Add time to a stage."""
+        self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    def add_conversion(self, tag: str, seconds: float) -> None:
+        """Count a converted record and add its conversion time."""
+        self.records[tag] += 1
+        self.conversion_seconds[tag] = self.conversion_seconds.get(tag, 0.0) + seconds
+        self.add_time("convert", seconds)
+
+    def is_among_slowest(self, seconds: float, count: int) -> bool:
+        """Return whether a conversion time ranks among the slowest records."""
+        if len(self.slowest_records) < count:
+            return True
+        return count > 0 and seconds > self.slowest_records[-1].seconds
+
+    def add_slow_record(self, record: SlowRecord, count: int) -> None:
+        """Add a record to the slowest records, keeping at most count of them."""
+        if self.is_among_slowest(record.seconds, count):
+            self.slowest_records.append(record)
+            self.slowest_records.sort(key=lambda slow: slow.seconds, reverse=True)
+            del self.slowest_records[count:]
+
+    def iterate(self, stage: str, items: Iterable[T]) -> Iterator[T]:
+        """Iterate over items, adding the time spent producing them to a stage."""
+        iterator = iter(items)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.add_time(stage, time.perf_counter() - start)
+            yield item
+
+    def merge_conversion(self, other: ImportReport, slow_record_count: int) -> None:
+        """Add the conversion times, counts and slowest records of another report."""
+        for record in other.slowest_records:
+            self.add_slow_record(record, slow_record_count)
+        for tag, seconds in other.conversion_seconds.items():
+            self.conversion_seconds[tag] = (
+                self.conversion_seconds.get(tag, 0.0) + seconds
+            )
+        self.records.update(other.records)
+        self.date_cache_hits += other.date_cache_hits
+        self.date_cache_misses += other.date_cache_misses
+        self.add_time("convert", other.stage_seconds.get("convert", 0.0))
+
+    def to_dict(self) -> dict:
+        """Convert the report to a dictionary, e.g. for serializing to JSON."""
+        result = {}
+        for report_field in fields(self):
+            value = getattr(self, report_field.name)
+            if isinstance(value, list):
+                value = [asdict(item) for item in value]
+            elif isinstance(value, dict):
+                # plain dictionaries instead of counters and dataclasses
+                value = {
+                    key: asdict(item) if isinstance(item, HandlerStats) else item
+                    for key, item in value.items()
+                }
+            result[report_field.name] = value
+        return result
+
+
+class CountingDict(dict[K, V]):
+    """A dictionary counting the hits and misses of membership tests."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key) -> bool:
+        found = super().__contains__(key)
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return found
@@ -41,13 +41,13 @@ def handle_repository(
             assert isinstance(child.value, str), "Expected value to be a string"
             url = Url()
             url.set_path(child.value)
-            url.set_type(UrlType(UrlType.WEB_HOME))
+            url.set_type(util.gramps_type(UrlType, UrlType.WEB_HOME))
             repository.add_url(url)
         elif child.tag == g7const.EMAIL:
             assert isinstance(child.value, str), "Expected value to be a string"
             url = Url()
             url.set_path(child.value)
-            url.set_type(UrlType(UrlType.EMAIL))
+            url.set_type(util.gramps_type(UrlType, UrlType.EMAIL))
             repository.add_url(url)
         elif child.tag == g7const.NOTE:
             repository, note = util.add_note_to_object(child, repository)
@@ -7,3 +7,124 @@ class ImportSettings:
 
     head_plac_form: list[str] | None = None
     """Default place form from HEAD.PLAC.FORM, used when PLAC.FORM is absent."""
+
+    streaming: bool = False
+    """Parse and convert the file one level-0 record at a time.
+
+    Unless commit_batch_size is set, the objects are then committed in batches
+    of process.STREAMING_COMMIT_BATCH_SIZE, since a single transaction would
+    hold the objects of the whole file. The memory per record then no longer
+    grows with the size of the file; only the XREF map and the undo data kept
+    by Gramps still do. The file is read twice, so file-like inputs must be
+    seekable.
+    """
+
+    commit_batch_size: int | None = None
+    """Number of objects to add to the database per transaction.
+
+    Records are never split across transactions, so a batch may exceed this
+    size by the objects of one record. If None, the whole import is added in a
+    single transaction, unless streaming. Smaller batches bound the memory held
+    by the transaction and keep the batches committed so far if the import
+    fails.
+    """
+
+    bulk_write: bool = False
+    """Write objects to an SQLite database with batched multi-row INSERTs.
+
+    Bypasses the per-object SQL statements of the generic Gramps write path
+    and produces the same database, but stores no undo data for new objects
+    and emits no signals for them. Rows are buffered for at most
+    bulk.FLUSH_OBJECTS objects. Objects that already exist are updated on the
+    normal path. Only supported for the SQLite backend.
+    """
+
+    pipeline: bool = False
+    """Parse, convert and write records concurrently on separate threads.
+
+    Parsing and conversion run on background threads that hand records over
+    through bounded queues, so database writes can overlap with conversion
+    while memory stays bounded. Database writes remain on the calling thread.
+    """
+
+    handle_namespace: str | None = None
+    """Namespace from which to derive the handles of the imported objects.
+
+    If None, every object gets a random handle. Otherwise handles are derived
+    from this namespace (for example, a name for the file or family tree) and
+    the XREF of a record, or the path of the structure within its record for
+    inline objects such as events, citations and notes. Places are derived
+    from their name and enclosing place. Importing the same file with the same
+    namespace then gives the same handles.
+    """
+
+    incremental: bool = False
+    """Only convert the records that changed since the last incremental import.
+
+    The hash of each level-0 record and the objects created from it are stored
+    in extra tables of the database, in the transaction that writes the
+    record. On re-import, unchanged records are skipped, changed records
+    replace their objects and the objects of records missing from the file
+    are removed. A changed header causes a full re-import. Requires a DB-API
+    backend such as SQLite.
+    """
+
+    profile: bool = False
+    """Measure the time and memory spent in each record handler.
+
+    The statistics are added to the profile of the import report. Profiling
+    slows down the import; when disabled, the handlers are not touched at all.
+    With worker processes, only the conversion in the main process is profiled.
+    """
+
+    slow_record_threshold: float | None = None
+    """Log a warning for each level-0 record taking longer to convert.
+
+    In seconds. The warning names the XREF, tag and number of substructures
+    of the record. If None, no warnings are logged.
+    """
+
+    slow_record_count: int = 10
+    """Number of slowest records to keep in the import report."""
+
+    reuse_existing_places: bool = False
+    """Attach events to matching places already in the database.
+
+    Before conversion, all places of the database are read once into the
+    place cache, by name and parent place, so that importing into an existing
+    tree does not duplicate the places the trees share. Existing places keep
+    their properties.
+    """
+
+    place_merge_distance: float | None = None
+    """Merge a new place into an existing place within this many meters.
+
+    Only places with the same parent place and coordinates from MAP are
+    merged, e.g. different spellings of the same town. The nearest place
+    within the distance is used. If None, only places with identical
+    jurisdiction names are merged.
+    """
+
+    place_name_normalization: tuple[str, ...] = ()
+    """Normalizations of jurisdiction names when deduplicating places.
+
+    Any of "nfc" for Unicode NFC, "whitespace" to strip and collapse
+    whitespace, and "casefold" to ignore case. Places whose names are equal
+    after normalization are merged; the first name seen is displayed.
+    """
+
+    deduplicate_notes: bool = False
+    """Reuse one note for identical inline notes.
+
+    Inline notes with the same text, translations, MIME type and note type
+    share a single Note, e.g. a boilerplate note attached to every record.
+    Cannot be combined with an incremental import.
+    """
+
+    deduplicate_citations: bool = False
+    """Reuse one citation for identical citations.
+
+    Citations of the same source with the same page, quality, notes, media
+    and other content share a single Citation, as Gramps intends. Cannot be
+    combined with an incremental import.
+    """
@@ -4,7 +4,6 @@ from typing import List
 
 from gedcom7 import const as g7const
 from gedcom7 import types as g7types
-from gedcom7 import util as g7util
 from gramps.gen.lib import (
     Note,
     NoteType,
@@ -76,11 +75,11 @@ def handle_source(
         # add the note text as a source note
         elif child.tag == g7const.TEXT:
             note = Note()
-            note.type = NoteType(NoteType.SOURCE_TEXT)
+            note.set_type(util.gramps_type(NoteType, NoteType.SOURCE_TEXT))
             if child.value is not None:
                 assert isinstance(child.value, str), "Expected value to be a string"
                 note.set(child.value)
-            note.handle = util.make_handle()
+            note.handle = util.structure_handle(child)
             source.add_note(note.handle)
             objects.append(note)
         elif child.tag == g7const.REPO:
@@ -90,21 +89,19 @@ def handle_source(
             except KeyError:
                 raise ValueError(f"Repository {child.pointer} not found")
             repo_ref.ref = repo_handle
-            call_number = g7util.get_first_child_with_tag(child, g7const.CALN)
+            call_number = util.first_child(child, g7const.CALN)
             # TODO handle reporef notes
             if call_number:
                 # TODO handle multiple call numbers in a single REPO
                 repo_ref.set_call_number(call_number.value)
-                media_type = g7util.get_first_child_with_tag(call_number, g7const.MEDI)
+                media_type = util.first_child(call_number, g7const.MEDI)
                 if media_type:
                     assert isinstance(
                         media_type.value, str
                     ), "Expected value to be a string"
 
                     # Check for MEDI PHRASE substructure
-                    phrase_structure = g7util.get_first_child_with_tag(
-                        media_type, g7const.PHRASE
-                    )
+                    phrase_structure = util.first_child(media_type, g7const.PHRASE)
 
                     if phrase_structure and phrase_structure.value:
                         # Use PHRASE as custom media type
@@ -63,6 +63,27 @@ class StreamlitProgressCallback:
                     pass
 
 
+# Ranges of the progress bar covered by the stages of the import
+IMPORT_PROGRESS_RANGES = {
+    "read": (0.3, 0.35),
+    "parse": (0.35, 0.45),
+    "convert": (0.45, 0.7),
+}
+
+
+def _import_progress(progress_callback):
+    """Map the progress of the import stages onto the progress bar."""
+    if progress_callback is None:
+        return None
+
+    def callback(stage, done, total):
+        if stage in IMPORT_PROGRESS_RANGES and total:
+            low, high = IMPORT_PROGRESS_RANGES[stage]
+            progress_callback(low + (high - low) * min(done / total, 1.0))
+
+    return callback
+
+
 def convert_gedcom_to_xml(
     gedcom_file, progress_callback=None
 ) -> Tuple[Optional[bytes], List[str], List[str]]:
@@ -103,10 +124,11 @@ def convert_gedcom_to_xml(
             input_temp_path = input_temp.name
 
         try:
-            if progress_callback:
-                progress_callback(0.5)
-
-            import_gedcom(input_file=input_temp_path, db=db)
+            import_gedcom(
+                input_file=input_temp_path,
+                db=db,
+                progress=_import_progress(progress_callback),
+            )
 
             if progress_callback:
                 progress_callback(0.7)
@@ -5,7 +5,6 @@ from typing import List
 from gedcom7 import const as g7const
 from gedcom7 import grammar as g7grammar
 from gedcom7 import types as g7types
-from gedcom7 import util as g7util
 from gramps.gen.lib import Address, Repository, RepositoryType, Researcher, Url, UrlType
 from gramps.gen.lib.primaryobj import BasicPrimaryObject
 
@@ -138,7 +137,7 @@ def handle_submitter(
     objects = []
 
     # Get submitter name for repository name
-    name_struct = g7util.get_first_child_with_tag(structure, g7const.NAME)
+    name_struct = util.first_child(structure, g7const.NAME)
     if name_struct and name_struct.value:
         repo_name = f"Submitter: {name_struct.value}"
     else:
@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
+import contextlib
+import contextvars
+import functools
 import uuid
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Iterator, Mapping, Sequence, TypeVar
 
 from gedcom7 import const as g7const
 from gedcom7 import grammar as g7grammar
@@ -18,6 +23,7 @@ from gramps.gen.lib import (
     SrcAttributeType,
     AttributeType,
 )
+from gramps.gen.lib.grampstype import GrampsType
 
 from .types import (
     BasicPrimaryObject,
@@ -28,6 +34,11 @@ from .types import (
     SrcAttributeBase,
 )
 
+if TYPE_CHECKING:
+    import numpy
+
+GrampsTypeT = TypeVar("GrampsTypeT", bound=GrampsType)
+
 
 # Mapping of GEDCOM 7 attribute tags to Gramps AttributeType
 # For standard attributes, we use the predefined AttributeType constants
@@ -51,9 +62,82 @@ GEDCOM_ATTRIBUTE_MAP = {
 }
 
 
-def make_handle() -> str:
-    """Generate a unique handle for a new object."""
-    return uuid.uuid4().hex
+# Namespace of deterministic handles, set by handle_namespace
+_handle_namespace: contextvars.ContextVar[uuid.UUID | None] = contextvars.ContextVar(
+    "handle_namespace", default=None
+)
+
+
+@contextlib.contextmanager
+def handle_namespace(namespace: str | None) -> Iterator[None]:
+    """Derive the handles made in this context from a namespace.
+
+    Args:
+        namespace: Name of the file or tree the handles belong to. If None,
+            random handles are made.
+    """
+    token = _handle_namespace.set(
+        None if namespace is None else uuid.uuid5(uuid.NAMESPACE_URL, namespace)
+    )
+    try:
+        yield
+    finally:
+        _handle_namespace.reset(token)
+
+
+def make_handle(key: str | None = None) -> str:
+    """Generate a unique handle for a new object.
+
+    Args:
+        key: A key identifying the object within its file, such as its XREF
+            or the path of the structure it is created from. Inside a
+            handle_namespace context, the handle is derived from the
+            namespace and the key, so the same input gives the same handle.
+            Otherwise, or without a key, the handle is random.
+    """
+    namespace = _handle_namespace.get()
+    if namespace is None or key is None:
+        return uuid.uuid4().hex
+    return uuid.uuid5(namespace, key).hex
+
+
+def structure_path(structure: g7types.GedcomStructure) -> str:
+    """Get a key identifying a structure by its position in its record.
+
+    The key consists of the record's XREF (or tag) followed by the tag and
+    the index among siblings with the same tag of each structure down to
+    the given one, e.g. ``@I1@/BIRT.0/SOUR.1``. Within an indexed_structures
+    context, the indexes of all children of a structure are computed once.
+    """
+    index = _structure_index.get()
+    parts = []
+    while structure.parent is not None:
+        parent = structure.parent
+        if index is None:
+            position = 0
+            for sibling in parent.children:
+                if sibling is structure:
+                    break
+                if sibling.tag == structure.tag:
+                    position += 1
+        else:
+            position = index.position(structure)
+        parts.append(f"{structure.tag}.{position}")
+        structure = parent
+    parts.append(structure.xref or structure.tag)
+    return "/".join(reversed(parts))
+
+
+def structure_handle(structure: g7types.GedcomStructure) -> str:
+    """Generate a handle for a new object created from a substructure.
+
+    Inside a handle_namespace context, the handle is derived from the path
+    of the structure in its record, see structure_path. Otherwise it is
+    random, and the path is not computed.
+    """
+    if _handle_namespace.get() is None:
+        return uuid.uuid4().hex
+    return make_handle(structure_path(structure))
 
 
 def add_ids(
@@ -94,41 +178,181 @@ DATE_QUALITY_MODIFIER_MAP = {
 }
 
 
+def _index_children(
+    structure: g7types.GedcomStructure,
+) -> dict[str, list[g7types.GedcomStructure]]:
+    """Group the children of a structure by tag, keeping their order."""
+    children: dict[str, list[g7types.GedcomStructure]] = {}
+    for child in structure.children:
+        children.setdefault(child.tag, []).append(child)
+    return children
+
+
+class StructureIndex:
+    """Children of GEDCOM structures by tag, indexed on first use.
+
+    GedcomStructure has slots, no weak references and no hash, so the
+    structures are keyed by id. Each entry keeps its structure alive, so the
+    id cannot be reused while the index exists. The index is meant to live
+    for the conversion of one record.
+    """
+
+    def __init__(self):
+        self._children: dict[
+            int,
+            tuple[g7types.GedcomStructure, dict[str, list[g7types.GedcomStructure]]],
+        ] = {}
+        self._positions: dict[int, dict[int, int]] = {}
+
+    def children_by_tag(
+        self, structure: g7types.GedcomStructure
+    ) -> dict[str, list[g7types.GedcomStructure]]:
+        """Get the children of a structure by tag, indexing them once."""
+        entry = self._children.get(id(structure))
+        if entry is None:
+            entry = self._children[id(structure)] = (
+                structure,
+                _index_children(structure),
+            )
+        return entry[1]
+
+    def position(self, structure: g7types.GedcomStructure) -> int:
+        """Get the index of a structure among its siblings with the same tag."""
+        parent = structure.parent
+        assert parent is not None, "Expected a substructure"
+        positions = self._positions.get(id(parent))
+        if positions is None:
+            # the parent is kept alive by its entry in the children index
+            positions = self._positions[id(parent)] = {
+                id(child): position
+                for children in self.children_by_tag(parent).values()
+                for position, child in enumerate(children)
+            }
+        return positions[id(structure)]
+
+
+_structure_index: contextvars.ContextVar[StructureIndex | None] = (
+    contextvars.ContextVar("structure_index", default=None)
+)
+
+
+@contextlib.contextmanager
+def indexed_structures() -> Iterator[None]:
+    """Index the children of the structures looked up in this context by tag.
+
+    Handlers then scan the children of a structure only once, however often
+    they look up its substructures. The children of a structure must not
+    change within the context.
+    """
+    token = _structure_index.set(StructureIndex())
+    try:
+        yield
+    finally:
+        _structure_index.reset(token)
+
+
+def children_by_tag(
+    structure: g7types.GedcomStructure,
+) -> Mapping[str, list[g7types.GedcomStructure]]:
+    """Get the children of a structure by tag, in their original order."""
+    index = _structure_index.get()
+    if index is None:
+        return _index_children(structure)
+    return index.children_by_tag(structure)
+
+
+def children_with_tag(
+    structure: g7types.GedcomStructure, tag: str
+) -> list[g7types.GedcomStructure]:
+    """Get the children of a structure with a tag."""
+    return children_by_tag(structure).get(tag, [])
+
+
+def first_child(
+    structure: g7types.GedcomStructure, tag: str
+) -> g7types.GedcomStructure | None:
+    """Get the first child of a structure with a tag, or None.
+
+    Same as gedcom7.util.get_first_child_with_tag, but using the index of
+    the indexed_structures context, if any.
+    """
+    children = children_by_tag(structure).get(tag)
+    return children[0] if children else None
+
+
 def set_change_date(
     structure: g7types.GedcomStructure,
     obj: BasicPrimaryObjectT,
 ) -> BasicPrimaryObjectT:
     """Set the change date for a Gramps object."""
-    change_structure = g7util.get_first_child_with_tag(structure, g7const.CHAN)
+    change_structure = first_child(structure, g7const.CHAN)
     if not change_structure:
         # take creation date as fallback
-        change_structure = g7util.get_first_child_with_tag(structure, g7const.CREA)
+        change_structure = first_child(structure, g7const.CREA)
     if not change_structure:
         # no date found
         return obj
-    date_structure = g7util.get_first_child_with_tag(change_structure, g7const.DATE)
+    date_structure = first_child(change_structure, g7const.DATE)
     if not date_structure:
         # no date found
         return obj
-    assert isinstance(
-        date_structure.value, g7types.DateExact
-    ), "Expected date to be a DateExact object"
-    time_structure = g7util.get_first_child_with_tag(change_structure, g7const.TIME)
+    date = date_structure.value
+    assert isinstance(date, g7types.DateExact), "Expected date to be a DateExact object"
+    # the time is a substructure of the date
+    time_structure = first_child(date_structure, g7const.TIME)
     if time_structure:
-        assert isinstance(
-            time_structure.value, g7types.Time
-        ), "Expected time to be a Time object"
         time = time_structure.value
+        assert isinstance(time, g7types.Time), "Expected time to be a Time object"
     else:
         time = None
     datetime_value = g7util.date_exact_and_time_to_python_datetime(
-        date=date_structure.value,
-        time=time,
+        date=date, time=time
     )
     obj.change = int(datetime_value.timestamp())
     return obj
 
 
+# Maximum number of distinct prebuilt Gramps type values
+TYPE_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=TYPE_CACHE_SIZE)
+def gramps_type(
+    type_class: type[GrampsTypeT], value: int | str | tuple[int, str]
+) -> GrampsTypeT:
+    """Get a prebuilt Gramps type value shared by all handlers.
+
+    The type setters of Gramps objects, like ``Note.set_type``, copy the value
+    of the type passed to them, so the shared instance is never modified. It
+    must not be assigned to an object directly.
+
+    Args:
+        type_class: The Gramps type class, e.g. NoteType.
+        value: The value of the type: a predefined int, a string, or a tuple
+            of CUSTOM and a string.
+
+    Returns:
+        The prebuilt type value.
+    """
+    return type_class(value)
+
+
+# Note types of inline notes by the class name of the object they belong to
+NOTE_TYPE_MAP = {
+    "ChildRef": NoteType.CHILDREF,
+    "Family": NoteType.FAMILY,
+    "Person": NoteType.PERSON,
+    "PersonRef": NoteType.ASSOCIATION,
+    "Event": NoteType.EVENT,
+    "Place": NoteType.PLACE,
+    "Source": NoteType.SOURCE,
+    "Citation": NoteType.CITATION,
+    "Media": NoteType.MEDIA,
+    "Repository": NoteType.REPO,
+    "Name": NoteType.PERSONNAME,
+}
+
+
 def structure_to_note(structure: g7types.GedcomStructure) -> Note:
     """Create a note from a GEDCOM structure of type NOTE or SNOTE.
 
@@ -146,7 +370,7 @@ def structure_to_note(structure: g7types.GedcomStructure) -> Note:
         # set note type to HTML if MIME type is HTML
         if child.tag == g7const.MIME:
             if child.value == g7const.MIME_HTML:
-                note.type = NoteType(NoteType.HTML_CODE)
+                note.set_type(gramps_type(NoteType, NoteType.HTML_CODE))
         elif child.tag == g7const.TRAN:
             # iterate over translations - we just append them
             if child.value is None:
@@ -176,24 +400,9 @@ def add_note_to_object(
     note = structure_to_note(structure)
     
     # Select appropriate note type based on object class name
-    obj_class = obj.__class__.__name__
-    note_type_map = {
-        'ChildRef': NoteType.CHILDREF,
-        'Family': NoteType.FAMILY,
-        'Person': NoteType.PERSON,
-        'PersonRef': NoteType.ASSOCIATION,
-        'Event': NoteType.EVENT,
-        'Place': NoteType.PLACE,
-        'Source': NoteType.SOURCE,
-        'Citation': NoteType.CITATION,
-        'Media': NoteType.MEDIA,
-        'Repository': NoteType.REPO,
-        'Name': NoteType.PERSONNAME,
-    }
-    
-    note_type = note_type_map.get(obj_class, NoteType.GENERAL)
-    note.type = NoteType(note_type)
-    note.handle = make_handle()
+    note_type = NOTE_TYPE_MAP.get(obj.__class__.__name__, NoteType.GENERAL)
+    note.set_type(gramps_type(NoteType, note_type))
+    note.handle = structure_handle(structure)
     # set note change date to parent change date
     set_change_date(structure=structure, obj=note)
     obj.add_note(note.handle)
@@ -324,9 +533,179 @@ def gedcom_date_value_to_gramps_date(
                 and date_value.end.calendar in CALENDAR_MAP
             ):
                 date.set_calendar(CALENDAR_MAP[date_value.end.calendar])
+    if date.get_calendar() != Date.CAL_GREGORIAN:
+        # the sort value was computed for the Gregorian calendar
+        date.recalc_sort_value()
     return date
 
 
+# Maximum number of distinct DATE payloads whose Gramps dates are cached
+DATE_CACHE_SIZE = 4096
+
+
+class DateCache:
+    """Least recently used cache of converted dates, by DATE payload.
+
+    Real files repeat a small set of date values, like years or "ABT 1850",
+    very often, so most dates are copied from a cached Gramps date instead of
+    being converted again.
+
+    Args:
+        maxsize: Maximum number of cached dates.
+    """
+
+    def __init__(self, maxsize: int = DATE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._dates: OrderedDict[str, Date] = OrderedDict()
+
+    def get(self, text: str, date_value: g7types.DateValue) -> Date:
+        """Get a new Gramps date for a GEDCOM date value.
+
+        Args:
+            text: The DATE payload the date value was parsed from.
+            date_value: The GEDCOM date value, converted on a cache miss.
+
+        Returns:
+            A copy of the cached date, which the caller may modify.
+        """
+        date = self._dates.get(text)
+        if date is None:
+            self.misses += 1
+            date = gedcom_date_value_to_gramps_date(date_value)
+            self._dates[text] = date
+            if len(self._dates) > self.maxsize:
+                self._dates.popitem(last=False)
+        else:
+            self.hits += 1
+            self._dates.move_to_end(text)
+        return Date(date)
+
+
+# The date cache of the current import, if any
+_date_cache: contextvars.ContextVar[DateCache | None] = contextvars.ContextVar(
+    "date_cache", default=None
+)
+
+
+@contextlib.contextmanager
+def cached_dates(date_cache: DateCache) -> Iterator[None]:
+    """Convert the dates in this context with a date cache.
+
+    Args:
+        date_cache: The date cache of the import, which counts the hits and
+            misses of the dates converted in this context.
+    """
+    token = _date_cache.set(date_cache)
+    try:
+        yield
+    finally:
+        _date_cache.reset(token)
+
+
+def convert_date(text: str, date_value: g7types.DateValue) -> Date:
+    """Convert a GEDCOM date value, with the date cache of the context if any.
+
+    Args:
+        text: The DATE payload the date value was parsed from.
+        date_value: The GEDCOM date value.
+
+    Returns:
+        A new Gramps date, which the caller may modify.
+    """
+    date_cache = _date_cache.get()
+    if date_cache is None:
+        return gedcom_date_value_to_gramps_date(date_value)
+    return date_cache.get(text, date_value)
+
+
+def _sort_date(date_value: g7types.DateValue) -> tuple[g7types.Date | None, int]:
+    """Get the date determining the sort value of a date value and its calendar.
+
+    The calendar is chosen as in gedcom_date_value_to_gramps_date.
+    """
+    date: g7types.Date | None
+    if isinstance(date_value, g7types.Date):
+        date, calendars = date_value, [date_value.calendar]
+    elif isinstance(date_value, g7types.DateApprox):
+        date, calendars = date_value.date, [date_value.date.calendar]
+    elif isinstance(date_value, g7types.DatePeriod):
+        date = date_value.from_ or date_value.to
+        calendars = [d.calendar for d in (date_value.from_, date_value.to) if d]
+    elif isinstance(date_value, g7types.DateRange):
+        date = date_value.start or date_value.end
+        calendars = [d.calendar for d in (date_value.start, date_value.end) if d]
+    else:
+        return None, Date.CAL_GREGORIAN
+    if len(set(calendars)) == 1 and calendars[0] in CALENDAR_MAP:
+        return date, CALENDAR_MAP[calendars[0]]
+    return date, Date.CAL_GREGORIAN
+
+
+def gedcom_date_sort_values(
+    date_values: Sequence[g7types.DateValue],
+) -> numpy.ndarray:
+    """Compute the Gramps sort values of many GEDCOM date values at once.
+
+    The sort values equal those of the dates converted with
+    gedcom_date_value_to_gramps_date, i.e. the day number of the first date,
+    or 0 for an empty date. Gregorian and Julian day numbers are computed with
+    vectorized NumPy arithmetic, dates in other calendars one by one.
+
+    Requires NumPy.
+
+    Args:
+        date_values: The GEDCOM date values.
+
+    Returns:
+        A NumPy array of the sort values, in the order of the date values.
+    """
+    try:
+        import numpy as np
+    except ImportError as err:
+        raise ImportError(
+            "Batch date conversion requires NumPy, "
+            "install it with `pip install gramps-gedcom7[numpy]`"
+        ) from err
+
+    count = len(date_values)
+    year = np.zeros(count, dtype=np.int64)
+    month = np.zeros(count, dtype=np.int64)
+    day = np.zeros(count, dtype=np.int64)
+    calendar = np.zeros(count, dtype=np.int64)
+    for i, date_value in enumerate(date_values):
+        date, calendar[i] = _sort_date(date_value)
+        if date is not None:
+            ymd = gedcom_date_to_numeric_year_month_day(date)
+            year[i], month[i], day[i] = ymd["year"], ymd["month"], ymd["day"]
+    empty = (year == 0) & (month == 0) & (day == 0)
+
+    # as in Date._zero_adjust_ymd and gregorian_sdn/julian_sdn of Gramps
+    year = np.where(year == 0, 1, year)
+    month = np.maximum(month, 1)
+    day = np.maximum(day, 1)
+    year = np.where(year < 0, year + 4801, year + 4800)
+    early = month <= 2
+    month = np.where(early, month + 9, month - 3)
+    year = year - early
+    days_in_year = (month * 153 + 2) // 5 + day
+    gregorian = (
+        (year // 100) * 146097 // 4 + (year % 100) * 1461 // 4 + days_in_year - 32045
+    )
+    julian = year * 1461 // 4 + days_in_year - 32083
+    sort_values = np.where(calendar == Date.CAL_JULIAN, julian, gregorian)
+
+    for index in np.flatnonzero(
+        (calendar != Date.CAL_GREGORIAN) & (calendar != Date.CAL_JULIAN) & ~empty
+    ):
+        sort_values[index] = gedcom_date_value_to_gramps_date(
+            date_values[int(index)]
+        ).get_sort_value()
+    sort_values[empty] = 0
+    return sort_values
+
+
 def set_privacy_on_object(
     resn_structure: g7types.GedcomStructure, obj: BasicPrimaryObject
 ) -> None:
@@ -360,7 +739,7 @@ def add_media_ref_to_object(
     media_ref.ref = media_handle
     
     # Handle TITL substructure - title that overrides the media object's title
-    title_structure = g7util.get_first_child_with_tag(multimedia_link_structure, g7const.TITL)
+    title_structure = first_child(multimedia_link_structure, g7const.TITL)
     if title_structure and title_structure.value:
         assert isinstance(title_structure.value, str), "Expected TITL value to be a string"
         add_attribute_to_object(media_ref, "OBJE:TITL", title_structure.value)
@@ -388,9 +767,9 @@ def add_attribute_to_object(
     if isinstance(obj, SrcAttributeBase):
         attr = SrcAttribute()
         if isinstance(attr_type, str):
-            attr.set_type(SrcAttributeType(attr_type))
+            attr.set_type(gramps_type(SrcAttributeType, attr_type))
         elif isinstance(attr_type, int):
-            attr.set_type(SrcAttributeType(attr_type))
+            attr.set_type(gramps_type(SrcAttributeType, attr_type))
         elif isinstance(attr_type, tuple):
             attr.set_type(attr_type)
         else:
@@ -398,9 +777,9 @@ def add_attribute_to_object(
     elif isinstance(obj, AttributeBase):
         attr = Attribute()
         if isinstance(attr_type, str):
-            attr.set_type(AttributeType(attr_type))
+            attr.set_type(gramps_type(AttributeType, attr_type))
         elif isinstance(attr_type, int):
-            attr.set_type(AttributeType(attr_type))
+            attr.set_type(gramps_type(AttributeType, attr_type))
         elif isinstance(attr_type, tuple):
             attr.set_type(attr_type)
         else:
@@ -435,7 +814,7 @@ def handle_attribute_structure(
     # Handle TYPE substructure: for FACT and IDNO, when TYPE is present, it defines the attribute type;
     # for other tags, TYPE provides additional context but we keep the standard type.
     # Note: The code does not enforce the presence of TYPE for FACT and IDNO, but uses it if available.
-    type_structure = g7util.get_first_child_with_tag(structure, g7const.TYPE)
+    type_structure = first_child(structure, g7const.TYPE)
     if type_structure and type_structure.value and structure.tag in (g7const.FACT, g7const.IDNO):
         # For FACT and IDNO, use TYPE value as the custom attribute name
         type_value = type_structure.value
@@ -475,9 +854,7 @@ def handle_external_id(
     base_type = "EXID" if structure.tag == g7const.EXID else "REFN"
 
     # Check for TYPE substructure
-    type_child = next(
-        (c for c in structure.children if c.tag == g7const.TYPE), None
-    )
+    type_child = first_child(structure, g7const.TYPE)
 
     # Build the attribute type string
     if type_child and type_child.value:
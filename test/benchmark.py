@@ -0,0 +1,111 @@
+"""Benchmark the throughput and peak memory of importing large GEDCOM files.
+
+Synthetic files are generated with test/synthetic.py. Each run takes place in
+a fresh process, so its peak memory is not affected by earlier runs.
+
+Usage:
+
+    python test/benchmark.py -n 1000 -n 100000 -n 1000000
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import click
+
+from synthetic import write_gedcom
+
+TARGETS = ["import", "gedcom2xml"]
+
+
+def _peak_memory_mib() -> float:
+    """Get the peak resident memory of the current process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def _run(target: str, input_file: str, streaming: bool, workers: int) -> tuple:
+    """Run a target on a file and return the time taken and the peak memory."""
+    from gramps.gen.db.utils import make_database
+
+    from gramps_gedcom7.importer import import_gedcom
+    from gramps_gedcom7.settings import ImportSettings
+
+    settings = ImportSettings(streaming=streaming)
+    if target == "import":
+        start = time.perf_counter()
+        db = make_database("sqlite")
+        db.load(":memory:", callback=None)
+        import_gedcom(input_file, db, settings=settings, workers=workers)
+    else:
+        from gramps_gedcom7 import gedcom2xml
+
+        start = time.perf_counter()
+        with tempfile.TemporaryDirectory() as directory:
+            gedcom2xml.main.callback(input_file, os.path.join(directory, "out.gramps"))
+    return time.perf_counter() - start, _peak_memory_mib()
+
+
+@click.command()
+@click.option(
+    "--individuals",
+    "-n",
+    type=int,
+    multiple=True,
+    default=[1000, 100000, 1000000],
+    show_default=True,
+    help="Number of individuals of a synthetic file; can be repeated.",
+)
+@click.option(
+    "--target",
+    type=click.Choice(TARGETS),
+    multiple=True,
+    default=TARGETS,
+    show_default=True,
+    help="What to benchmark; can be repeated.",
+)
+@click.option("--streaming", is_flag=True, help="Use the streaming import.")
+@click.option("--workers", type=int, default=1, help="Number of worker processes.")
+@click.option(
+    "--data-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=Path(tempfile.gettempdir()),
+    help="Directory where the synthetic files are cached.",
+)
+def main(individuals, target, streaming, workers, data_dir) -> None:
+    """Report records/sec and peak memory of the GEDCOM import."""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    context = multiprocessing.get_context("spawn")
+    click.echo(
+        f"{'individuals':>12} {'target':>10} {'records':>10} {'seconds':>9} "
+        f"{'records/s':>10} {'peak MiB':>9}"
+    )
+    for count in individuals:
+        input_file = data_dir / f"synthetic_{count}.ged"
+        if not input_file.exists():
+            write_gedcom(input_file, count)
+        with open(input_file, encoding="utf-8") as f:
+            # all level-0 records except HEAD and TRLR
+            records = sum(line.startswith("0 ") for line in f) - 2
+        for name in target:
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                seconds, peak = executor.submit(
+                    _run, name, str(input_file), streaming, workers
+                ).result()
+            click.echo(
+                f"{count:>12} {name:>10} {records:>10} {seconds:>9.2f} "
+                f"{records / seconds:>10.0f} {peak:>9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
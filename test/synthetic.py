@@ -0,0 +1,174 @@
+"""Generate large synthetic GEDCOM 7 files for tests and benchmarks."""
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import Iterator
+
+GIVEN_NAMES = {
+    "M": "John William James George Charles Henry Thomas Peter".split(),
+    "F": "Mary Anna Elizabeth Margaret Sarah Emma Alice Clara".split(),
+}
+SURNAMES = (
+    "Smith Miller Schmidt Johnson Brown Weber Fischer Wilson "
+    "Taylor Meyer Wagner Becker Clark Lewis Walker Hall"
+).split()
+MONTHS = "JAN FEB MAR APR MAY JUN JUL AUG SEP OCT NOV DEC".split()
+COUNTRIES = ["USA", "Germany", "England", "Ireland", "Sweden"]
+
+# Number of records of each type per individual, if not given explicitly
+FAMILY_RATIO = 0.4
+SOURCE_RATIO = 0.02
+NOTE_RATIO = 0.01
+MEDIA_RATIO = 0.01
+PLACE_RATIO = 0.05
+
+
+def _date(rng: random.Random, year: int) -> str:
+    return f"{rng.randint(1, 28)} {rng.choice(MONTHS)} {year}"
+
+
+def _places(rng: random.Random, count: int) -> list[str]:
+    """Generate places with a City, County, State, Country hierarchy."""
+    places = []
+    for i in range(count):
+        country = rng.choice(COUNTRIES)
+        state = f"State {rng.randrange(10)} {country}"
+        county = f"County {rng.randrange(20)} {state}"
+        places.append(f"City {i}, {county}, {state}, {country}")
+    return places
+
+
+def generate_gedcom(
+    individuals: int,
+    families: int | None = None,
+    sources: int | None = None,
+    notes: int | None = None,
+    media: int | None = None,
+    places: int | None = None,
+    seed: int = 0,
+) -> Iterator[str]:
+    """Generate the lines of a valid GEDCOM 7 file.
+
+    Individuals have names, birth and death events with places, source
+    citations and occasionally shared notes and multimedia. Families form a
+    multi-generation tree: the spouses of each family are individuals, and
+    the parents of each child are older than the child. Sources refer to a
+    repository, and places use a City, County, State, Country hierarchy.
+
+    Args:
+        individuals: Number of individuals.
+        families: Number of families. Each needs two individuals as spouses.
+        sources: Number of sources.
+        notes: Number of shared notes.
+        media: Number of multimedia records.
+        places: Number of distinct cities.
+        seed: Seed of the random generator, so the output is reproducible.
+
+    Yields:
+        The lines of the file, each ending with a line feed.
+    """
+    rng = random.Random(seed)
+    if families is None:
+        families = int(individuals * FAMILY_RATIO)
+    families = min(families, individuals // 2)
+    if sources is None:
+        sources = max(1, int(individuals * SOURCE_RATIO))
+    if notes is None:
+        notes = int(individuals * NOTE_RATIO)
+    if media is None:
+        media = int(individuals * MEDIA_RATIO)
+    if places is None:
+        places = max(1, int(individuals * PLACE_RATIO))
+    cities = _places(rng, places)
+
+    # individuals 2i and 2i+1 are the spouses of family i; every other
+    # individual is the child of a family of older individuals
+    parent_family: list[int | None] = [None] * individuals
+    children: list[list[int]] = [[] for _ in range(families)]
+    for i in range(2, individuals):
+        if families and rng.random() < 0.9:
+            family = rng.randrange(min(families, i // 2))
+            parent_family[i] = family
+            children[family].append(i)
+
+    yield "0 HEAD\n"
+    yield "1 GEDC\n"
+    yield "2 VERS 7.0\n"
+    yield "1 PLAC\n"
+    yield "2 FORM City, County, State, Country\n"
+
+    yield "0 @R1@ REPO\n"
+    yield "1 NAME State Archive\n"
+    for i in range(sources):
+        yield f"0 @S{i}@ SOUR\n"
+        yield f"1 TITL Parish register {i}\n"
+        yield f"1 AUTH {rng.choice(SURNAMES)} parish\n"
+        yield "1 REPO @R1@\n"
+        yield f"2 CALN {rng.randrange(1000, 9999)}\n"
+    for i in range(notes):
+        yield f"0 @N{i}@ SNOTE Research note {i}\n"
+        yield "1 CONT with a second line of text\n"
+    for i in range(media):
+        yield f"0 @O{i}@ OBJE\n"
+        yield f"1 FILE media/photo{i}.jpg\n"
+        yield "2 FORM image/jpeg\n"
+        yield f"2 TITL Photo {i}\n"
+
+    for i in range(individuals):
+        sex = "M" if i % 2 == 0 else "F"
+        given = rng.choice(GIVEN_NAMES[sex])
+        surname = rng.choice(SURNAMES)
+        birth_year = 1700 + i * 300 // max(individuals, 1)
+        yield f"0 @I{i}@ INDI\n"
+        yield f"1 NAME {given} /{surname}/\n"
+        yield f"2 GIVN {given}\n"
+        yield f"2 SURN {surname}\n"
+        yield f"1 SEX {sex}\n"
+        yield "1 BIRT\n"
+        yield f"2 DATE {_date(rng, birth_year)}\n"
+        yield f"2 PLAC {rng.choice(cities)}\n"
+        yield f"2 SOUR @S{rng.randrange(sources)}@\n"
+        yield f"3 PAGE Entry {rng.randrange(1, 500)}\n"
+        if rng.random() < 0.6:
+            yield "1 DEAT\n"
+            yield f"2 DATE {_date(rng, birth_year + rng.randint(1, 90))}\n"
+            yield f"2 PLAC {rng.choice(cities)}\n"
+        if notes and rng.random() < 0.1:
+            yield f"1 SNOTE @N{rng.randrange(notes)}@\n"
+        if media and rng.random() < 0.05:
+            yield f"1 OBJE @O{rng.randrange(media)}@\n"
+        if parent_family[i] is not None:
+            yield f"1 FAMC @F{parent_family[i]}@\n"
+        if i < 2 * families:
+            yield f"1 FAMS @F{i // 2}@\n"
+
+    for i in range(families):
+        yield f"0 @F{i}@ FAM\n"
+        yield f"1 HUSB @I{2 * i}@\n"
+        yield f"1 WIFE @I{2 * i + 1}@\n"
+        for child in children[i]:
+            yield f"1 CHIL @I{child}@\n"
+        yield "1 MARR\n"
+        yield f"2 DATE {_date(rng, 1720 + i * 300 // max(individuals, 1))}\n"
+        yield f"2 PLAC {rng.choice(cities)}\n"
+
+    yield "0 TRLR\n"
+
+
+def write_gedcom(path: str | Path, individuals: int, **kwargs) -> Path:
+    """Write a synthetic GEDCOM 7 file.
+
+    Args:
+        path: The file to write.
+        individuals: Number of individuals.
+        **kwargs: Further arguments to generate_gedcom.
+
+    Returns:
+        The path of the written file.
+    """
+    path = Path(path)
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(generate_gedcom(individuals, **kwargs))
+    return path
@@ -0,0 +1,70 @@
+"""Test the bulk SQLite writer."""
+
+import itertools
+
+import pytest
+from gramps.gen.db import DbWriteBase
+
+from gramps_gedcom7 import bulk
+from gramps_gedcom7.importer import import_gedcom
+from gramps_gedcom7.settings import ImportSettings
+
+from util import dump_tables, new_database
+
+
+def _dump(db: DbWriteBase) -> dict:
+    """Dump the object and reference tables and the derived metadata."""
+    dump = dump_tables(db)
+    db.dbapi.execute(
+        "SELECT obj_handle, obj_class, ref_handle, ref_class FROM reference "
+        "ORDER BY obj_handle, ref_handle"
+    )
+    dump["reference"] = db.dbapi.fetchall()
+    dump["surnames"] = sorted(db.get_surname_list())
+    dump["person_attributes"] = sorted(db.get_person_attribute_types())
+    dump["gender_stats"] = db.genderStats.stats
+    return dump
+
+
+def _import(
+    monkeypatch, settings: ImportSettings, times: int = 1
+) -> DbWriteBase:
+    """Import one or more times with reproducible handles and timestamps."""
+    counter = itertools.count()
+    monkeypatch.setattr(
+        "gramps_gedcom7.util.uuid.uuid4",
+        lambda: type("UUID", (), {"hex": f"{next(counter):032x}"})(),
+    )
+    monkeypatch.setattr("time.time", lambda: 1700000000.0)
+    db = new_database()
+    for _ in range(times):
+        import_gedcom("test/data/maximal70.ged", db, settings=settings)
+    return db
+
+
+@pytest.mark.parametrize("flush_objects", [bulk.FLUSH_OBJECTS, 3])
+@pytest.mark.parametrize("batch_size", [None, 7])
+def test_bulk_write_matches_normal_path(monkeypatch, batch_size, flush_objects):
+    """Test that the bulk writer produces the same database as the normal path."""
+    monkeypatch.setattr(bulk, "FLUSH_OBJECTS", flush_objects)
+    normal = _dump(_import(monkeypatch, ImportSettings(commit_batch_size=batch_size)))
+    bulk_dump = _dump(
+        _import(
+            monkeypatch, ImportSettings(bulk_write=True, commit_batch_size=batch_size)
+        )
+    )
+    assert bulk_dump["person"]
+    for key in normal:
+        assert bulk_dump[key] == normal[key], key
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_bulk_write_reimport(monkeypatch, streaming):
+    """Test that re-importing with deterministic handles updates the objects."""
+    settings = ImportSettings(handle_namespace="maximal70", streaming=streaming)
+    normal = _dump(_import(monkeypatch, settings, times=2))
+    settings.bulk_write = True
+    bulk_dump = _dump(_import(monkeypatch, settings, times=2))
+    assert bulk_dump["person"]
+    for key in normal:
+        assert bulk_dump[key] == normal[key], key
@@ -0,0 +1,69 @@
+"""Test committing the import in batches of objects."""
+
+import pytest
+
+from gramps_gedcom7 import process
+from gramps_gedcom7.importer import import_gedcom
+from gramps_gedcom7.settings import ImportSettings
+
+from util import new_database
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_batched_import_matches_single_transaction(streaming):
+    """Test that small batches create the same objects as one transaction."""
+    gedcom_file = "test/data/maximal70.ged"
+    db_single = new_database()
+    import_gedcom(gedcom_file, db_single, settings=ImportSettings(streaming=streaming))
+    db_batched = new_database()
+    import_gedcom(
+        gedcom_file,
+        db_batched,
+        settings=ImportSettings(streaming=streaming, commit_batch_size=1),
+    )
+    for count in (
+        "get_number_of_people",
+        "get_number_of_families",
+        "get_number_of_events",
+        "get_number_of_places",
+        "get_number_of_citations",
+        "get_number_of_sources",
+        "get_number_of_notes",
+        "get_number_of_media",
+        "get_number_of_repositories",
+    ):
+        assert getattr(db_batched, count)() == getattr(db_single, count)()
+
+
+def _write_broken_file(gedcom_file):
+    gedcom_file.write_text(
+        "0 HEAD\n1 GEDC\n2 VERS 7.0\n"
+        "0 @I1@ INDI\n1 NAME John /Smith/\n"
+        "0 @I2@ INDI\n1 NAME Jane /Doe/\n"
+        "0 @I3@ INDI\n1 NAME Broken /Record/\n1 SNOTE @N99@\n"
+        "0 TRLR\n",
+        encoding="utf-8",
+    )
+    return gedcom_file
+
+
+def test_failed_import_keeps_committed_batches(tmp_path):
+    """Test that a failing record only rolls back its own batch."""
+    gedcom_file = _write_broken_file(tmp_path / "broken.ged")
+    db = new_database()
+    with pytest.raises(ValueError):
+        import_gedcom(
+            gedcom_file, db, settings=ImportSettings(streaming=True, commit_batch_size=1)
+        )
+    assert db.get_number_of_people() == 2
+    assert db.get_person_from_gramps_id("I3") is None
+
+
+def test_streaming_commits_in_batches_by_default(tmp_path, monkeypatch):
+    """Test that a streaming import without a batch size is still batched."""
+    monkeypatch.setattr(process, "STREAMING_COMMIT_BATCH_SIZE", 1)
+    gedcom_file = _write_broken_file(tmp_path / "broken.ged")
+    db = new_database()
+    with pytest.raises(ValueError):
+        import_gedcom(gedcom_file, db, settings=ImportSettings(streaming=True))
+    assert db.get_number_of_people() == 2
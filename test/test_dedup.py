@@ -0,0 +1,87 @@
+"""Test the deduplication of identical inline objects."""
+
+import pytest
+from gramps.gen.db import DbWriteBase
+
+from gramps_gedcom7.importer import import_gedcom
+from gramps_gedcom7.settings import ImportSettings
+
+from util import new_database
+
+GEDCOM_FILE = "test/data/inline_note_duplicates.ged"
+
+
+def _person_note_texts(db: DbWriteBase, gramps_id: str) -> list[str]:
+    person = db.get_person_from_gramps_id(gramps_id)
+    return [db.get_note_from_handle(handle).get() for handle in person.get_note_list()]
+
+
+def test_notes_not_deduplicated_by_default():
+    """Test that every inline note is a separate note by default."""
+    db = new_database()
+    report = import_gedcom(GEDCOM_FILE, db)
+    assert db.get_number_of_notes() == 6
+    assert not report.deduplicated
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_identical_inline_notes_deduplicated(workers):
+    """Test that identical inline notes share one note."""
+    db = new_database()
+    settings = ImportSettings(deduplicate_notes=True)
+    report = import_gedcom(GEDCOM_FILE, db, settings=settings, workers=workers)
+    # person notes, the event note, the note with translation and the SNOTE
+    # are all different notes
+    assert db.get_number_of_notes() == 5
+    assert report.deduplicated["Note"] == 1
+    assert report.objects["Note"] == 5
+    i1 = db.get_person_from_gramps_id("I1")
+    i2 = db.get_person_from_gramps_id("I2")
+    assert i1.get_note_list()[0] == i2.get_note_list()[0]
+    assert _person_note_texts(db, "I2") == ["Imported from X", "Another note"]
+    assert _person_note_texts(db, "I3")[0] == "Imported from X\n\nImportiert aus X"
+    # the shared note is not replaced
+    assert len(set(_person_note_texts(db, "I3"))) == 2
+    for handle in db.get_note_handles():
+        assert next(db.find_backlink_handles(handle), None) is not None
+
+
+def test_deduplicate_notes_not_incremental():
+    """Test that deduplicated notes are rejected in an incremental import."""
+    settings = ImportSettings(deduplicate_notes=True, incremental=True)
+    with pytest.raises(ValueError):
+        import_gedcom(GEDCOM_FILE, new_database(), settings=settings)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_identical_citations_deduplicated(workers):
+    """Test that identical citations share one citation and its notes."""
+    db = new_database()
+    settings = ImportSettings(deduplicate_citations=True)
+    report = import_gedcom(
+        "test/data/citation_duplicates.ged", db, settings=settings, workers=workers
+    )
+    assert db.get_number_of_citations() == 3
+    assert db.get_number_of_notes() == 2
+    assert report.deduplicated == {"Citation": 1, "Note": 1}
+    births = {}
+    for person in db.iter_people():
+        for event_ref in person.get_event_ref_list():
+            event = db.get_event_from_handle(event_ref.ref)
+            if event.get_type() == "Birth":
+                births[person.gramps_id] = event.get_citation_list()
+    assert births["I1"] == births["I2"]
+    i3 = db.get_person_from_gramps_id("I3")
+    assert i3.get_citation_list() != births["I1"]
+    for handle in db.get_citation_handles():
+        assert next(db.find_backlink_handles(handle), None) is not None
+    for handle in db.get_note_handles():
+        assert next(db.find_backlink_handles(handle), None) is not None
+
+
+def test_citations_not_deduplicated_by_default():
+    """Test that every citation is a separate citation by default."""
+    db = new_database()
+    import_gedcom("test/data/citation_duplicates.ged", db)
+    assert db.get_number_of_citations() == 4
+    assert db.get_number_of_notes() == 3
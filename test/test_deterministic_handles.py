@@ -0,0 +1,81 @@
+"""Test deriving handles deterministically from a namespace."""
+
+import gedcom7
+import pytest
+from gramps.gen.db import DbWriteBase
+
+from gramps_gedcom7.importer import import_gedcom
+from gramps_gedcom7.settings import ImportSettings
+from gramps_gedcom7 import util
+from gramps_gedcom7.util import handle_namespace, make_handle
+
+from util import OBJECT_TABLES, dump_tables, new_database
+
+
+def _import(monkeypatch, settings: ImportSettings, **kwargs) -> DbWriteBase:
+    # change times are set by the database when the objects are committed
+    monkeypatch.setattr("time.time", lambda: 1700000000.0)
+    db = new_database()
+    import_gedcom("test/data/maximal70.ged", db, settings=settings, **kwargs)
+    return db
+
+
+def test_make_handle():
+    """Test that handles are derived from the namespace and key."""
+    assert make_handle("@I1@") != make_handle("@I1@")
+    with handle_namespace("tree"):
+        assert make_handle("@I1@") == make_handle("@I1@")
+        assert make_handle("@I1@") != make_handle("@I2@")
+        assert make_handle() != make_handle()
+        handle = make_handle("@I1@")
+    with handle_namespace("other"):
+        assert make_handle("@I1@") != handle
+
+
+def test_structure_path_and_handle(monkeypatch):
+    """Test that structure paths are computed only for deterministic handles."""
+    record = gedcom7.loads(
+        "0 HEAD\n1 GEDC\n2 VERS 7.0\n"
+        "0 @I1@ INDI\n1 BIRT\n1 RESI\n1 BIRT\n2 SOUR @S1@\n2 SOUR @S1@\n"
+        "0 @S1@ SOUR\n0 TRLR\n"
+    )[1]
+    source = record.children[2].children[1]
+    assert util.structure_path(source) == "@I1@/BIRT.1/SOUR.1"
+    with util.indexed_structures():
+        assert util.structure_path(source) == "@I1@/BIRT.1/SOUR.1"
+        assert util.structure_path(record.children[1]) == "@I1@/RESI.0"
+    with handle_namespace("tree"):
+        assert util.structure_handle(source) == make_handle("@I1@/BIRT.1/SOUR.1")
+    monkeypatch.setattr(util, "structure_path", None)
+    assert util.structure_handle(source) != util.structure_handle(source)
+
+
+def test_same_namespace_gives_identical_database(monkeypatch):
+    """Test that importing twice with the same namespace gives the same rows."""
+    settings = ImportSettings(handle_namespace="maximal70")
+    dump = dump_tables(_import(monkeypatch, settings))
+    assert dump_tables(_import(monkeypatch, settings)) == dump
+    random_dump = dump_tables(_import(monkeypatch, ImportSettings()))
+    # every object gets its own handle
+    for table in OBJECT_TABLES:
+        assert len(dump[table]) == len(random_dump[table])
+        assert len({row[0] for row in dump[table]}) == len(dump[table])
+    other = dump_tables(_import(monkeypatch, ImportSettings(handle_namespace="other")))
+    assert {row[0] for row in other["person"]}.isdisjoint(
+        row[0] for row in dump["person"]
+    )
+
+
+@pytest.mark.parametrize(
+    "settings, workers",
+    [
+        (ImportSettings(handle_namespace="maximal70", streaming=True), 1),
+        (ImportSettings(handle_namespace="maximal70", pipeline=True), 1),
+        (ImportSettings(handle_namespace="maximal70"), 2),
+    ],
+)
+def test_import_modes_give_identical_database(monkeypatch, settings, workers):
+    """Test that all import modes derive the same handles."""
+    settings_serial = ImportSettings(handle_namespace="maximal70")
+    dump = dump_tables(_import(monkeypatch, settings_serial))
+    assert dump_tables(_import(monkeypatch, settings, workers=workers)) == dump
@@ -0,0 +1,155 @@
+"""Test the incremental re-import of changed records."""
+
+import pytest
+from gramps.gen.db import DbWriteBase
+
+from gramps_gedcom7 import incremental, process
+from gramps_gedcom7.importer import import_gedcom
+from gramps_gedcom7.settings import ImportSettings
+
+from util import new_database
+
+HEADER = "0 HEAD\n1 GEDC\n2 VERS 7.0\n"
+
+JOHN = (
+    "0 @I1@ INDI\n1 NAME John /Smith/\n1 SEX M\n"
+    "1 BIRT\n2 PLAC Baltimore, Maryland, USA\n"
+)
+JANE = (
+    "0 @I2@ INDI\n1 NAME Jane /Doe/\n1 SEX F\n"
+    "1 BIRT\n2 PLAC Boston, Massachusetts, USA\n"
+)
+FAMILY = "0 @F1@ FAM\n1 HUSB @I1@\n1 WIFE @I2@\n1 MARR\n2 DATE 1 JAN 1900\n"
+JIM = (
+    "0 @I3@ INDI\n1 NAME Jim /Smith/\n1 SEX M\n"
+    "1 BIRT\n2 PLAC Salem, Massachusetts, USA\n"
+)
+
+
+def _import(db, tmp_path, *records, **kwargs):
+    gedcom_file = tmp_path / "tree.ged"
+    gedcom_file.write_text(HEADER + "".join(records) + "0 TRLR\n", encoding="utf-8")
+    settings = ImportSettings(incremental=True, **kwargs)
+    import_gedcom(gedcom_file, db, settings=settings)
+
+
+def _summary(db: DbWriteBase) -> dict:
+    return {
+        "people": sorted(
+            (p.gramps_id, p.get_primary_name().get_first_name())
+            for p in db.iter_people()
+        ),
+        "families": db.get_number_of_families(),
+        "events": sorted(
+            (str(e.get_type()), str(e.get_date_object())) for e in db.iter_events()
+        ),
+        "places": sorted(p.get_name().get_value() for p in db.iter_places()),
+    }
+
+
+@pytest.fixture
+def converted_xrefs(monkeypatch):
+    """Record the XREFs of the records that are converted."""
+    xrefs = []
+    handle_structure = process.handle_structure
+
+    def _handle_structure(structure, **kwargs):
+        if structure.xref:
+            xrefs.append(structure.xref)
+        return handle_structure(structure, **kwargs)
+
+    monkeypatch.setattr(process, "handle_structure", _handle_structure)
+    return xrefs
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_unchanged_file_converts_nothing(tmp_path, converted_xrefs, streaming):
+    """Test that re-importing an unchanged file skips all records."""
+    db = new_database()
+    _import(db, tmp_path, JOHN, JANE, FAMILY, streaming=streaming)
+    summary = _summary(db)
+    converted_xrefs.clear()
+    _import(db, tmp_path, JOHN, JANE, FAMILY, streaming=streaming)
+    assert converted_xrefs == []
+    assert _summary(db) == summary
+
+
+def test_changed_records_are_replaced(tmp_path, converted_xrefs):
+    """Test that only changed records are converted and deleted ones removed."""
+    db = new_database()
+    _import(db, tmp_path, JOHN, JANE, FAMILY)
+    john_handle = db.get_person_from_gramps_id("I1").handle
+    converted_xrefs.clear()
+    jane_renamed = JANE.replace("Jane", "Janet")
+    family_without_jane = FAMILY.replace("1 WIFE @I2@\n", "")
+    _import(db, tmp_path, JOHN, family_without_jane, JIM)
+    assert converted_xrefs == ["@F1@", "@I3@"]
+    _import(db, tmp_path, JOHN, jane_renamed, FAMILY, JIM)
+
+    expected = new_database()
+    import_gedcom(_write(tmp_path, JOHN, jane_renamed, FAMILY, JIM), expected)
+    assert _summary(db) == _summary(expected)
+    # unchanged records keep their handles and references
+    assert db.get_person_from_gramps_id("I1").handle == john_handle
+    family = db.get_family_from_gramps_id("F1")
+    assert family.get_father_handle() == john_handle
+    assert db.get_person_from_handle(family.get_mother_handle()).gramps_id == "I2"
+
+
+def test_orphan_places_are_removed(tmp_path):
+    """Test that places only used by deleted records are removed."""
+    db = new_database()
+    _import(db, tmp_path, JOHN, JANE, JIM)
+    assert db.get_number_of_places() == 6
+    _import(db, tmp_path, JOHN, JANE)
+    assert sorted(p.get_name().get_value() for p in db.iter_places()) == [
+        "Baltimore",
+        "Boston",
+        "Maryland",
+        "Massachusetts",
+        "USA",
+    ]
+    _import(db, tmp_path, JOHN)
+    assert db.get_number_of_places() == 3
+
+
+def test_place_notes_belong_to_the_place(tmp_path):
+    """Test that the inline notes of a cached place are kept with the place."""
+    db = new_database()
+    john = JOHN + "3 NOTE Place note\n"
+    _import(db, tmp_path, john, JANE)
+    assert db.get_number_of_notes() == 1
+    _import(db, tmp_path, john.replace("John", "Johnny"), JANE)
+    note_handles = set(db.get_note_handles())
+    assert len(note_handles) == 1
+    for place in db.iter_places():
+        assert set(place.get_note_list()) <= note_handles
+    # removed with the place
+    _import(db, tmp_path, JANE)
+    assert db.get_number_of_notes() == 0
+    assert db.get_number_of_places() == 3
+
+
+def test_aborted_import_keeps_state_consistent(tmp_path, converted_xrefs):
+    """Test that the state of committed batches is kept when an import fails."""
+    db = new_database()
+    _import(db, tmp_path, JOHN, JANE)
+    jane_renamed = JANE.replace("Jane", "Janet")
+    broken = "0 @I4@ INDI\n1 NAME Broken /Record/\n1 SNOTE @N99@\n"
+    with pytest.raises(ValueError):
+        _import(db, tmp_path, JOHN, jane_renamed, broken, commit_batch_size=1)
+    converted_xrefs.clear()
+    _import(db, tmp_path, JOHN, jane_renamed, JIM)
+    # Jane's new state was committed with her objects
+    assert converted_xrefs == ["@I3@"]
+    expected = new_database()
+    import_gedcom(_write(tmp_path, JOHN, jane_renamed, JIM), expected)
+    assert _summary(db) == _summary(expected)
+    db.dbapi.execute(f"SELECT xref FROM {incremental.RECORD_TABLE} ORDER BY xref")
+    assert db.dbapi.fetchall() == [("@I1@",), ("@I2@",), ("@I3@",), ("HEAD",)]
+
+
+def _write(tmp_path, *records):
+    gedcom_file = tmp_path / "expected.ged"
+    gedcom_file.write_text(HEADER + "".join(records) + "0 TRLR\n", encoding="utf-8")
+    return gedcom_file
@@ -0,0 +1,89 @@
+"""Guard the peak memory of imports against regressions.
+
+Synthetic files of increasing size are imported into an in-memory database
+while tracemalloc traces the Python allocations; memory held by SQLite itself
+is not traced. The peak must stay within a per-individual budget, and must
+grow no faster than linearly with the size of the input. A streaming import
+committed in small batches must not need more memory per individual for a
+larger file.
+"""
+
+import tracemalloc
+
+import pytest
+
+from gramps_gedcom7.importer import import_gedcom
+from gramps_gedcom7.settings import ImportSettings
+from synthetic import write_gedcom
+from util import new_database
+
+# Numbers of individuals of the synthetic files, smallest first
+SIZES = [100, 400]
+
+# Peak bytes traced per individual, recorded at about 52 kB for the full and
+# 47 kB for the streaming import, with some headroom
+BUDGET = {False: 64_000, True: 58_000}
+
+# Allowed increase of the peak per individual from the smallest to the
+# largest file
+MAX_GROWTH = 1.25
+
+# Objects per transaction of the batched streaming import, well below the
+# objects of the smallest file
+COMMIT_BATCH_SIZE = 50
+
+# Allowed increase of the peak per individual of the batched streaming
+# import, for measurement noise
+TOLERANCE = 1.05
+
+
+def _peak_bytes(gedcom_file, settings: ImportSettings) -> int:
+    """Import a file and return the peak memory traced during the import."""
+    db = new_database()
+    start_tracing = not tracemalloc.is_tracing()
+    if start_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        import_gedcom(gedcom_file, db, settings=settings)
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        if start_tracing:
+            tracemalloc.stop()
+
+
+def _bytes_per_individual(tmp_path, settings: ImportSettings) -> list[float]:
+    """Get the peak memory per individual of importing each size of file."""
+    bytes_per_individual = []
+    for individuals in SIZES:
+        gedcom_file = write_gedcom(tmp_path / f"{individuals}.ged", individuals)
+        bytes_per_individual.append(_peak_bytes(gedcom_file, settings) / individuals)
+    return bytes_per_individual
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_peak_memory_per_individual(tmp_path, streaming):
+    """Test that the peak memory is within budget and scales linearly."""
+    bytes_per_individual = _bytes_per_individual(
+        tmp_path, ImportSettings(streaming=streaming)
+    )
+    for individuals, peak in zip(SIZES, bytes_per_individual):
+        assert peak < BUDGET[streaming], (
+            f"{peak:.0f} bytes per individual with {individuals} individuals"
+        )
+    assert bytes_per_individual[-1] < MAX_GROWTH * bytes_per_individual[0], (
+        f"peak memory per individual grows from {bytes_per_individual[0]:.0f} "
+        f"to {bytes_per_individual[-1]:.0f} bytes"
+    )
+
+
+def test_streaming_peak_memory_per_individual(tmp_path):
+    """Test that the peak memory per individual does not grow with the file."""
+    bytes_per_individual = _bytes_per_individual(
+        tmp_path, ImportSettings(streaming=True, commit_batch_size=COMMIT_BATCH_SIZE)
+    )
+    assert bytes_per_individual[-1] <= TOLERANCE * bytes_per_individual[0], (
+        f"peak memory per individual grows from {bytes_per_individual[0]:.0f} "
+        f"to {bytes_per_individual[-1]:.0f} bytes"
+    )
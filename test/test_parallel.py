@@ -0,0 +1,68 @@
+"""Test converting the records in worker processes."""
+
+import pytest
+from gramps.gen.db import DbWriteBase
+
+from gramps_gedcom7 import process
+from gramps_gedcom7.importer import import_gedcom
+from gramps_gedcom7.settings import ImportSettings
+
+from util import new_database, summarize
+
+
+def _place_path(db: DbWriteBase, handle: str) -> tuple[str, ...]:
+    """Get the names of a place and its enclosing places."""
+    path = []
+    while handle:
+        place = db.get_place_from_handle(handle)
+        path.append(place.get_name().get_value())
+        placerefs = place.get_placeref_list()
+        handle = placerefs[0].ref if placerefs else None
+    return tuple(path)
+
+
+def _summary(db: DbWriteBase) -> dict:
+    """Summarize the objects, comparing places by their enclosing places."""
+    return {
+        **summarize(db),
+        "places": sorted(_place_path(db, h) for h in db.get_place_handles()),
+        "events": sorted(
+            (
+                str(e.get_type()),
+                str(e.get_date_object()),
+                _place_path(db, e.get_place_handle()),
+            )
+            for e in db.iter_events()
+        ),
+    }
+
+
+@pytest.mark.parametrize(
+    "gedcom_file",
+    [
+        "test/data/maximal70.ged",
+        "test/data/place_deduplication.ged",
+        "test/data/place_different.ged",
+    ],
+)
+@pytest.mark.parametrize("streaming", [False, True])
+def test_parallel_import_matches_serial(gedcom_file, streaming, monkeypatch):
+    """Test that worker processes create the same objects as the serial path."""
+    # one record per chunk, so places shared across records must be reconciled
+    monkeypatch.setattr(process, "PARALLEL_CHUNK_SIZE", 1)
+    settings = ImportSettings(streaming=streaming)
+    db_serial = new_database()
+    import_gedcom(gedcom_file, db_serial, settings=settings)
+    db_parallel = new_database()
+    import_gedcom(gedcom_file, db_parallel, settings=settings, workers=2)
+    assert _summary(db_parallel) == _summary(db_serial)
+
+
+def test_parallel_import_reuses_places(monkeypatch):
+    """Test that places shared by records in different chunks are merged."""
+    monkeypatch.setattr(process, "PARALLEL_CHUNK_SIZE", 1)
+    db = new_database()
+    import_gedcom("test/data/place_deduplication.ged", db, workers=2)
+    db_serial = new_database()
+    import_gedcom("test/data/place_deduplication.ged", db_serial)
+    assert db.get_number_of_places() == db_serial.get_number_of_places()
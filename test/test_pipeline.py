@@ -0,0 +1,55 @@
+"""Test the pipelined import with parsing and conversion on separate threads."""
+
+import threading
+
+import pytest
+
+from gramps_gedcom7 import process
+from gramps_gedcom7.importer import import_gedcom
+from gramps_gedcom7.settings import ImportSettings
+
+from util import new_database, summarize
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_pipeline_import_matches_sequential(streaming, monkeypatch):
+    """Test that the pipeline creates the same objects as the sequential path."""
+    # a tiny queue makes every stage wait for the next one
+    monkeypatch.setattr(process, "PIPELINE_QUEUE_SIZE", 1)
+    gedcom_file = "test/data/maximal70.ged"
+    db_sequential = new_database()
+    import_gedcom(
+        gedcom_file, db_sequential, settings=ImportSettings(streaming=streaming)
+    )
+    db_pipeline = new_database()
+    import_gedcom(
+        gedcom_file,
+        db_pipeline,
+        settings=ImportSettings(
+            streaming=streaming, pipeline=True, commit_batch_size=5
+        ),
+    )
+    assert summarize(db_pipeline) == summarize(db_sequential)
+
+
+def test_pipeline_propagates_errors(tmp_path):
+    """Test that an error in the conversion stage is raised and stops all stages."""
+    gedcom_file = tmp_path / "broken.ged"
+    gedcom_file.write_text(
+        "0 HEAD\n1 GEDC\n2 VERS 7.0\n"
+        "0 @I1@ INDI\n1 NAME John /Smith/\n"
+        "0 @I2@ INDI\n1 NAME Broken /Record/\n1 SNOTE @N99@\n"
+        "0 @I3@ INDI\n1 NAME Jane /Doe/\n"
+        "0 TRLR\n",
+        encoding="utf-8",
+    )
+    threads = threading.active_count()
+    db = new_database()
+    with pytest.raises(ValueError, match="N99"):
+        import_gedcom(
+            gedcom_file,
+            db,
+            settings=ImportSettings(streaming=True, pipeline=True, commit_batch_size=1),
+        )
+    assert db.get_number_of_people() == 1
+    assert threading.active_count() == threads
@@ -1,9 +1,16 @@
 """Test place deduplication."""
 
+import gedcom7
+import pytest
 from gramps.gen.db import DbWriteBase
 from gramps.gen.db.utils import make_database
 
+from gramps_gedcom7 import process
+from gramps_gedcom7.event import PlaceCache, handle_place
 from gramps_gedcom7.importer import import_gedcom
+from gramps_gedcom7.settings import ImportSettings
+
+from util import new_database
 
 
 def test_places_are_deduplicated():
@@ -138,3 +145,60 @@ def test_different_places_not_deduplicated():
     state2_handle = county2.get_placeref_list()[0].get_reference_handle()
     state2 = db.get_place_from_handle(state2_handle)
     assert state2.get_name().get_value() == "Cork"
+
+
+def test_place_path_memo():
+    """Test that a repeated jurisdiction list is found in the path memo."""
+    gedcom_file = "test/data/place_deduplication.ged"
+    gedcom_structures = gedcom7.loads(open(gedcom_file, encoding="utf-8").read())
+    settings = ImportSettings()
+    xref_handle_map = process.make_xref_handle_map(
+        structure.xref for structure in gedcom_structures if structure.xref
+    )
+    place_cache = PlaceCache()
+    places = [
+        child
+        for structure in gedcom_structures
+        if structure.tag == "INDI"
+        for event in structure.children
+        for child in event.children
+        if child.tag == "PLAC" and child.value
+    ]
+    handle, objects = handle_place(places[0], xref_handle_map, settings, place_cache)
+    assert len(objects) == 4
+    assert place_cache.paths == {(tuple(places[0].value), None): handle}
+    hits = place_cache.hits
+    assert handle_place(places[1], xref_handle_map, settings, place_cache) == (
+        handle,
+        [],
+    )
+    assert place_cache.hits == hits + 4
+
+    # removing a place, e.g. in an incremental import, invalidates the memo
+    del place_cache[(("USA",), None)]
+    assert not place_cache.paths
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reuse_existing_places(workers):
+    """Test that a second import attaches its events to the existing places."""
+    gedcom_file = "test/data/place_deduplication.ged"
+    db = new_database()
+    import_gedcom(gedcom_file, db)
+    place_handles = set(db.get_place_handles())
+    settings = ImportSettings(reuse_existing_places=True)
+    report = import_gedcom(gedcom_file, db, settings=settings, workers=workers)
+    assert set(db.get_place_handles()) == place_handles
+    assert report.place_cache_misses == 0
+    assert "places" in report.stage_seconds
+    for event in db.iter_events():
+        assert event.get_place_handle() in place_handles
+
+
+def test_existing_places_duplicated_by_default():
+    """Test that existing places are not reused unless requested."""
+    gedcom_file = "test/data/place_deduplication.ged"
+    db = new_database()
+    import_gedcom(gedcom_file, db)
+    import_gedcom(gedcom_file, db)
+    assert db.get_number_of_places() == 8
@@ -0,0 +1,53 @@
+"""Test normalizing place names for deduplication."""
+
+import pytest
+
+from gramps_gedcom7 import process
+from gramps_gedcom7.event import PlaceCache, normalize_place_name
+from gramps_gedcom7.importer import import_gedcom
+from gramps_gedcom7.settings import ImportSettings
+
+from util import new_database
+
+
+def _place_names(normalization: tuple[str, ...], workers: int = 1) -> list[str]:
+    db = new_database()
+    settings = ImportSettings(place_name_normalization=normalization)
+    import_gedcom(
+        "test/data/place_name_variants.ged", db, settings=settings, workers=workers
+    )
+    return sorted(place.get_name().value for place in db.iter_places())
+
+
+def test_place_names_not_normalized_by_default():
+    """Test that variants of a name are different places by default."""
+    assert len(_place_names(())) == 5
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_place_names_normalized(workers, monkeypatch):
+    """Test that variants of a name are merged, keeping the first name."""
+    monkeypatch.setattr(process, "PARALLEL_CHUNK_SIZE", 1)
+    names = _place_names(("nfc", "whitespace", "casefold"), workers=workers)
+    assert names == ["Frankfurt am Main", "Germany", "München"]
+
+
+def test_normalizations_are_configurable():
+    """Test that only the configured normalizations apply."""
+    # the Frankfurt variants also differ in case
+    assert len(_place_names(("nfc", "whitespace"))) == 4
+    assert len(_place_names(("nfc",))) == 4
+    assert len(_place_names(("whitespace", "casefold"))) == 4
+
+
+def test_normalize_place_name():
+    """Test the normalizations of a single name."""
+    nfd = "Mu\u0308nchen"
+    assert normalize_place_name(nfd) == nfd
+    assert normalize_place_name(nfd, ("nfc",)) == "München"
+    assert normalize_place_name(" New  York ", ("whitespace",)) == "New York"
+    assert normalize_place_name("STRASSE", ("casefold",)) == "strasse"
+    key = normalize_place_name("".join(["Ber", "lin"]))
+    assert key is normalize_place_name("".join(["Be", "rlin"]))
+    with pytest.raises(ValueError):
+        PlaceCache(normalization=("lowercase",))
@@ -0,0 +1,82 @@
+"""Test merging nearby places by their coordinates."""
+
+import pytest
+from gramps.gen.db import DbWriteBase
+
+from gramps_gedcom7 import process
+from gramps_gedcom7.event import PlaceCache
+from gramps_gedcom7.importer import import_gedcom
+from gramps_gedcom7.settings import ImportSettings
+
+from util import new_database
+
+GEDCOM_FILE = "test/data/place_spatial_merge.ged"
+
+
+def _import(settings: ImportSettings, workers: int = 1) -> DbWriteBase:
+    db = new_database()
+    import_gedcom(GEDCOM_FILE, db, settings=settings, workers=workers)
+    return db
+
+
+def _event_place_names(db: DbWriteBase) -> dict[str, str]:
+    """Map the Gramps ID and event type of each event to its place name."""
+    names = {}
+    for person in db.iter_people():
+        for event_ref in person.get_event_ref_list():
+            event = db.get_event_from_handle(event_ref.ref)
+            place = db.get_place_from_handle(event.get_place_handle())
+            names[f"{person.gramps_id} {event.get_type()}"] = place.get_name().value
+    return names
+
+
+def test_places_not_merged_by_default():
+    """Test that differently spelled places are kept apart by default."""
+    names = _event_place_names(_import(ImportSettings()))
+    assert names["I1 Birth"] == "St. Louis"
+    assert names["I2 Birth"] == "Saint Louis"
+    assert names["I2 Death"] == "Saint Louis"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_nearby_places_merged(workers, monkeypatch):
+    """Test that a nearby place with the same parent is merged."""
+    monkeypatch.setattr(process, "PARALLEL_CHUNK_SIZE", 1)
+    db = _import(ImportSettings(place_merge_distance=500), workers=workers)
+    names = _event_place_names(db)
+    assert names["I1 Birth"] == "St. Louis"
+    assert names["I2 Birth"] == "St. Louis"
+    # the merged name is remembered for events without coordinates
+    assert names["I2 Death"] == "St. Louis"
+    # too far away
+    assert names["I3 Birth"] == "Kirkwood"
+    # different parent
+    assert names["I4 Birth"] == "St. Louis"
+    place_names = sorted(place.get_name().value for place in db.iter_places())
+    assert place_names == [
+        "Illinois",
+        "Kirkwood",
+        "Missouri",
+        "St. Louis",
+        "St. Louis",
+        "USA",
+    ]
+
+
+def test_find_nearby():
+    """Test finding the nearest place within the merge distance."""
+    place_cache = PlaceCache(merge_distance=1000)
+    place_cache.add_location("parent", "N60.0", "E10.0", "a")
+    place_cache.add_location("parent", "N60.0", "E10.01", "b")
+    place_cache.add_location("other", "N60.0", "E10.0", "c")
+    # about 280 m from a and 280 m from b at this latitude
+    assert place_cache.find_nearby("parent", "N60.0", "E10.005") in ("a", "b")
+    assert place_cache.find_nearby("parent", "N60.0", "E10.009") == "b"
+    assert place_cache.find_nearby("parent", "S60.0", "E10.0") is None
+    assert place_cache.find_nearby("parent", "N60.0", "E10.03") is None
+    assert place_cache.find_nearby(None, "N60.0", "E10.0") is None
+    # longitude cells are narrower in meters far from the equator
+    place_cache.add_location("parent", "N89.99", "E0.0", "pole")
+    assert place_cache.find_nearby("parent", "N89.99", "E30.0") == "pole"
+    with pytest.raises(ValueError):
+        PlaceCache(merge_distance=0)
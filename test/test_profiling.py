@@ -0,0 +1,77 @@
+"""Test profiling the record handlers."""
+
+import json
+import threading
+
+from gramps_gedcom7 import event, individual, process
+from gramps_gedcom7.importer import import_gedcom
+from gramps_gedcom7.profiling import format_profile, profile_handlers
+from gramps_gedcom7.settings import ImportSettings
+
+from util import new_database
+
+GEDCOM_FILE = "test/data/maximal70.ged"
+
+# the original handlers, before any profiling
+HANDLERS = (process.handle_structure, individual.handle_event, event.handle_place)
+
+
+def _handlers() -> tuple:
+    return (process.handle_structure, individual.handle_event, event.handle_place)
+
+
+def test_profile_handlers():
+    """Test that the profile counts the calls of each handler."""
+    report = import_gedcom(
+        GEDCOM_FILE, new_database(), settings=ImportSettings(profile=True)
+    )
+    profile = report.profile
+    # all records and the trailer
+    assert profile["handle_structure"].calls == sum(report.records.values()) + 1
+    assert profile["handle_individual"].calls == report.records["INDI"]
+    assert profile["handle_family"].calls == report.records["FAM"]
+    assert profile["handle_event"].calls > 0
+    assert profile["handle_place"].calls > 0
+    # nested handlers are included in the time of their callers
+    assert profile["handle_individual"].seconds <= profile["handle_structure"].seconds
+    assert profile["handle_individual"].allocated > 0
+    table = format_profile(profile)
+    assert table.splitlines()[1].startswith("handle_structure")
+    json.dumps(report.to_dict())
+    # the original handlers are restored
+    assert _handlers() == HANDLERS
+
+
+def test_profile_with_pipeline():
+    """Test that conversions on the pipeline thread are profiled."""
+    settings = ImportSettings(profile=True, pipeline=True)
+    report = import_gedcom(GEDCOM_FILE, new_database(), settings=settings)
+    assert report.profile["handle_individual"].calls == report.records["INDI"]
+
+
+def test_overlapping_profiles():
+    """Test that overlapping profiles only count their own calls."""
+    outer: dict = {}
+    inner: dict = {}
+    with profile_handlers(outer, trace_memory=False):
+        with profile_handlers(inner):
+            import_gedcom(GEDCOM_FILE, new_database())
+        # the inner context keeps the wrappers of the outer one
+        assert _handlers() != HANDLERS
+        # imports in other threads are not profiled
+        reports = []
+        thread = threading.Thread(
+            target=lambda: reports.append(import_gedcom(GEDCOM_FILE, new_database()))
+        )
+        thread.start()
+        thread.join()
+    assert reports[0].records["INDI"] > 0
+    assert inner["handle_individual"].calls > 0
+    assert outer["handle_individual"].calls == 0
+    assert _handlers() == HANDLERS
+
+
+def test_no_profile_by_default():
+    """Test that imports are not profiled unless requested."""
+    report = import_gedcom(GEDCOM_FILE, new_database())
+    assert report.profile == {}
@@ -0,0 +1,45 @@
+"""Test the progress callback of the import."""
+
+import pytest
+
+from gramps_gedcom7.importer import import_gedcom
+from gramps_gedcom7.progress import Progress
+from gramps_gedcom7.settings import ImportSettings
+
+from util import new_database
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_progress_reports_all_stages(streaming, monkeypatch):
+    """Test that each stage reports increasing progress up to its total."""
+    # report every update
+    monkeypatch.setattr("gramps_gedcom7.progress.MIN_INTERVAL", 0.0)
+    updates: list[tuple[str, int, int | None]] = []
+    report = import_gedcom(
+        "test/data/maximal70.ged",
+        new_database(),
+        settings=ImportSettings(streaming=streaming),
+        progress=lambda *update: updates.append(update),
+    )
+    stages = {stage: [] for stage, _, _ in updates}
+    assert list(stages) == ["read", "parse", "convert", "write"]
+    for stage, done, total in updates:
+        stages[stage].append((done, total))
+    for stage, values in stages.items():
+        done = [value[0] for value in values]
+        assert done == sorted(done), stage
+        assert values[-1][0] == values[-1][1], stage
+    assert stages["convert"][-1][0] == sum(report.records.values())
+    assert stages["write"][-1][0] == sum(report.objects.values())
+    assert len(stages["convert"]) > 2
+
+
+def test_progress_is_rate_limited():
+    """Test that updates of a stage are dropped within the minimum interval."""
+    calls = []
+    progress = Progress(lambda *update: calls.append(update), min_interval=3600)
+    for done in range(100):
+        progress("convert", done, 100)
+        progress("write", done)
+    progress("convert", 100, 100, force=True)
+    assert calls == [("convert", 0, 100), ("write", 0, None), ("convert", 100, 100)]
@@ -0,0 +1,66 @@
+"""Test the report returned by the import."""
+
+import json
+
+import pytest
+
+from gramps_gedcom7 import ImportReport, process
+from gramps_gedcom7.importer import import_gedcom
+from gramps_gedcom7.settings import ImportSettings
+from synthetic import write_gedcom
+from util import new_database
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_report_counts_objects(streaming):
+    """Test that the report counts the records and objects of the import."""
+    db = new_database()
+    report = import_gedcom(
+        "test/data/maximal70.ged", db, settings=ImportSettings(streaming=streaming)
+    )
+    assert isinstance(report, ImportReport)
+    assert report.objects["Person"] == db.get_number_of_people()
+    assert report.objects["Family"] == db.get_number_of_families()
+    assert report.objects["Event"] == db.get_number_of_events()
+    assert report.objects["Place"] == db.get_number_of_places()
+    assert report.objects["Note"] == db.get_number_of_notes()
+    assert report.records["INDI"] == 4
+    assert report.records["FAM"] == 2
+    assert set(report.conversion_seconds) == set(report.records)
+    expected_stages = {"parse", "xref_map", "convert", "write"}
+    if not streaming:
+        expected_stages.add("read")
+    assert set(report.stage_seconds) == expected_stages
+    assert sum(report.stage_seconds.values()) <= report.total_seconds
+    json.dumps(report.to_dict())
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_report_counts_place_cache(workers, monkeypatch):
+    """Test that the report counts reused and created places."""
+    monkeypatch.setattr(process, "PARALLEL_CHUNK_SIZE", 1)
+    db = new_database()
+    report = import_gedcom("test/data/place_deduplication.ged", db, workers=workers)
+    # empty places bypass the cache
+    assert report.place_cache_misses == db.get_number_of_places()
+    assert report.place_cache_hits > 0
+    serial = import_gedcom("test/data/place_deduplication.ged", new_database())
+    assert report.place_cache_hits == serial.place_cache_hits
+    assert report.records == serial.records
+    assert report.objects == serial.objects
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_report_counts_date_cache(workers, monkeypatch, tmp_path):
+    """Test that the report counts the dates converted and copied."""
+    monkeypatch.setattr(process, "PARALLEL_CHUNK_SIZE", 10)
+    gedcom_file = write_gedcom(tmp_path / "synthetic.ged", 100)
+    with open(gedcom_file, encoding="utf-8") as f:
+        dates = [line for line in f if line.startswith("2 DATE ")]
+    report = import_gedcom(gedcom_file, new_database(), workers=workers)
+    assert report.date_cache_hits + report.date_cache_misses == len(dates)
+    if workers == 1:
+        assert report.date_cache_misses == len(set(dates))
+        # each import has its own cache
+        report = import_gedcom(gedcom_file, new_database(), workers=workers)
+        assert report.date_cache_misses == len(set(dates))
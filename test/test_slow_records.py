@@ -0,0 +1,52 @@
+"""Test the log and ranking of slow records."""
+
+import logging
+
+import pytest
+
+from gramps_gedcom7.importer import import_gedcom
+from gramps_gedcom7.report import ImportReport, SlowRecord
+from gramps_gedcom7.settings import ImportSettings
+
+from util import new_database
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_slowest_records_in_report(workers):
+    """Test that the report keeps the slowest records, slowest first."""
+    settings = ImportSettings(slow_record_count=3)
+    report = import_gedcom(
+        "test/data/maximal70.ged", new_database(), settings=settings, workers=workers
+    )
+    assert len(report.slowest_records) == 3
+    seconds = [record.seconds for record in report.slowest_records]
+    assert seconds == sorted(seconds, reverse=True)
+    assert all(record.tag != "TRLR" for record in report.slowest_records)
+    assert isinstance(report.to_dict()["slowest_records"][0], dict)
+
+
+def test_slow_records_logged(caplog):
+    """Test that records above the threshold are logged."""
+    settings = ImportSettings(slow_record_threshold=0)
+    with caplog.at_level(logging.WARNING, logger="gramps_gedcom7.process"):
+        import_gedcom("test/data/maximal70.ged", new_database(), settings=settings)
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("@I1@ INDI" in message for message in messages)
+    assert not any("TRLR" in message for message in messages)
+
+
+def test_slow_records_not_logged_by_default(caplog):
+    """Test that nothing is logged without a threshold."""
+    with caplog.at_level(logging.WARNING, logger="gramps_gedcom7.process"):
+        import_gedcom("test/data/maximal70.ged", new_database())
+    assert not caplog.records
+
+
+def test_add_slow_record_keeps_count():
+    """Test that only the given number of slowest records is kept."""
+    report = ImportReport()
+    for seconds in [0.1, 0.5, 0.3, 0.2]:
+        report.add_slow_record(SlowRecord("@X@", "INDI", 1, seconds), 2)
+    assert [record.seconds for record in report.slowest_records] == [0.5, 0.3]
+    assert not report.is_among_slowest(0.2, 2)
+    assert not report.is_among_slowest(1.0, 0)
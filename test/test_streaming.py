@@ -0,0 +1,71 @@
+"""Test the streaming record-by-record import."""
+
+import io
+
+from gramps.gen.db import DbWriteBase
+
+from gramps_gedcom7 import reader
+from gramps_gedcom7.importer import import_gedcom
+from gramps_gedcom7.settings import ImportSettings
+
+from util import new_database, summarize
+
+
+GEDCOM_FILE = "test/data/maximal70.ged"
+
+
+def _import(input_file, streaming: bool) -> DbWriteBase:
+    db = new_database()
+    import_gedcom(input_file, db, settings=ImportSettings(streaming=streaming))
+    return db
+
+
+def test_iter_records_yields_level0_records():
+    """Test that the reader yields one structure per level-0 record."""
+    with reader.open_lines(GEDCOM_FILE) as lines:
+        records = list(reader.iter_records(lines))
+    assert records[0].tag == "HEAD"
+    assert records[-1].tag == "TRLR"
+    assert [r.xref for r in records[1:3]] == ["@F1@", "@F2@"]
+    assert all(r.parent is None for r in records)
+
+
+def test_iter_records_resolves_extension_tags():
+    """Test that extension tags documented in HEAD.SCHMA are resolved per record."""
+    with reader.open_lines(GEDCOM_FILE) as lines:
+        records = list(reader.iter_records(lines))
+    submitter = next(r for r in records if r.xref == "@U1@")
+    tags = [child.tag for child in submitter.children]
+    assert "http://xmlns.com/foaf/0.1/skypeID" in tags
+
+
+def test_streaming_matches_full_import():
+    """Test that the streaming import creates the same objects as the full import."""
+    assert summarize(_import(GEDCOM_FILE, streaming=True)) == summarize(
+        _import(GEDCOM_FILE, streaming=False)
+    )
+
+
+def test_streaming_from_binary_file_object():
+    """Test that the streaming import accepts a seekable binary file object."""
+    with open(GEDCOM_FILE, "rb") as f:
+        data = io.BytesIO(f.read())
+    db = _import(data, streaming=True)
+    assert db.get_person_from_gramps_id("I1") is not None
+    assert not data.closed
+
+
+def test_scan_xrefs_matches_parsed_records():
+    """Test that the XREF pre-scan finds exactly the XREFs of the parsed records."""
+    with reader.open_lines(GEDCOM_FILE) as lines:
+        expected = {r.xref: r.tag for r in reader.iter_records(lines) if r.xref}
+    assert reader.scan_xrefs(GEDCOM_FILE) == expected
+
+
+def test_scan_xrefs_across_chunks_and_line_endings(monkeypatch):
+    """Test the pre-scan with tiny chunks and CR, LF and CR-LF line endings."""
+    monkeypatch.setattr(reader, "CHUNK_SIZE", 3)
+    data = "0 HEAD\r\n1 GEDC\r2 VERS 7.0\n0 @I1@ INDI\r\n1 NAME @I2@\r0 @F_1@ FAM\n0 TRLR"
+    expected = {"@I1@": "INDI", "@F_1@": "FAM"}
+    assert reader.scan_xrefs(io.StringIO(data)) == expected
+    assert reader.scan_xrefs(io.BytesIO(data.encode("utf-8"))) == expected
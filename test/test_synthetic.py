@@ -0,0 +1,39 @@
+"""Test the synthetic GEDCOM generator used by the benchmarks."""
+
+from gramps_gedcom7.importer import import_gedcom
+from synthetic import generate_gedcom, write_gedcom
+from util import new_database
+
+
+def test_generate_gedcom_is_reproducible():
+    """Test that the same seed generates the same file."""
+    assert list(generate_gedcom(50, seed=1)) == list(generate_gedcom(50, seed=1))
+    assert list(generate_gedcom(50, seed=1)) != list(generate_gedcom(50, seed=2))
+
+
+def test_synthetic_file_imports(tmp_path):
+    """Test that a synthetic file imports with the requested record counts."""
+    gedcom_file = write_gedcom(
+        tmp_path / "synthetic.ged",
+        individuals=200,
+        families=60,
+        sources=5,
+        notes=3,
+        media=4,
+        places=10,
+    )
+    db = new_database()
+    import_gedcom(gedcom_file, db)
+    assert db.get_number_of_people() == 200
+    assert db.get_number_of_families() == 60
+    assert db.get_number_of_sources() == 5
+    assert db.get_number_of_notes() == 3
+    assert db.get_number_of_media() == 4
+    assert db.get_number_of_repositories() == 1
+    # cities with their counties, states and countries
+    assert 10 < db.get_number_of_places() <= 40
+    for family in db.iter_families():
+        for child_ref in family.get_child_ref_list():
+            child = db.get_person_from_handle(child_ref.ref)
+            father = db.get_person_from_handle(family.get_father_handle())
+            assert int(father.gramps_id[1:]) < int(child.gramps_id[1:])
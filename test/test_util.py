@@ -1,7 +1,23 @@
-from gedcom7 import types as g7types
-from gramps.gen.lib import Date
+from datetime import datetime, timezone
 
-from gramps_gedcom7.util import gedcom_date_value_to_gramps_date
+import gedcom7
+import pytest
+from gedcom7 import types as g7types
+from gramps.gen.lib import Date, EventType, Note, NoteType
+
+from gramps_gedcom7 import util
+from gramps_gedcom7.util import (
+    DateCache,
+    cached_dates,
+    children_by_tag,
+    children_with_tag,
+    convert_date,
+    first_child,
+    gedcom_date_sort_values,
+    gedcom_date_value_to_gramps_date,
+    gramps_type,
+    set_change_date,
+)
 
 
 def test_gedcom_date_value_to_gramps_date_date():
@@ -231,3 +247,150 @@ def test_gedcom_date_value_to_gramps_date_period_from_with_julian():
     assert year == 1500
     assert month == 11
     assert day == 5
+
+
+def test_date_cache_returns_copies():
+    """Test that the date cache converts each payload once and returns copies."""
+    date_cache = DateCache()
+    date_value = g7types.DateApprox(
+        date=g7types.Date(year=1850, month=None, day=None, calendar=None),
+        approx="ABT",
+    )
+    first = date_cache.get("ABT 1850", date_value)
+    first.set_text_value("about 1850")
+    second = date_cache.get("ABT 1850", date_value)
+    assert second is not first
+    assert second.get_year() == 1850
+    assert second.get_modifier() == Date.MOD_ABOUT
+    assert second.get_text() == ""
+    assert (date_cache.hits, date_cache.misses) == (1, 1)
+
+
+def test_date_cache_evicts_least_recently_used():
+    """Test that the date cache keeps at most maxsize dates."""
+    date_cache = DateCache(maxsize=2)
+    for year in [1850, 1851, 1850, 1852, 1851, 1850]:
+        date_value = g7types.Date(year=year, month=None, day=None, calendar=None)
+        assert date_cache.get(str(year), date_value).get_year() == year
+    # 1851 was evicted by 1852, then 1850 by 1851
+    assert (date_cache.hits, date_cache.misses) == (1, 5)
+
+
+def test_convert_date_with_context_cache():
+    """Test that dates are only cached within a cached_dates context."""
+    date_cache = DateCache()
+    date_value = g7types.Date(year=1850, month=None, day=None, calendar=None)
+    assert convert_date("1850", date_value).get_year() == 1850
+    with cached_dates(date_cache):
+        convert_date("1850", date_value)
+        assert convert_date("1850", date_value).get_year() == 1850
+    convert_date("1850", date_value)
+    assert (date_cache.hits, date_cache.misses) == (1, 1)
+
+
+def test_julian_date_sort_value():
+    """Test that the sort value of a Julian date uses the Julian calendar."""
+    date_value = g7types.Date(year=1700, month="JAN", day=1, calendar="JULIAN")
+    gramps_date = gedcom_date_value_to_gramps_date(date_value)
+    expected = Date(1700, 1, 1)
+    expected.set_calendar(Date.CAL_JULIAN)
+    expected.recalc_sort_value()
+    assert gramps_date.get_sort_value() == expected.get_sort_value()
+
+
+def test_gedcom_date_sort_values():
+    """Test that the batch sort values equal those of the converted dates."""
+    pytest.importorskip("numpy")
+    dates = [
+        g7types.Date(year=2023, month="OCT", day=15, calendar="GREGORIAN"),
+        g7types.Date(year=1850, month=None, day=None, calendar=None),
+        g7types.Date(year=1582, month="FEB", day=29, calendar="JULIAN"),
+        g7types.Date(year=-44, month="MAR", day=15, calendar="JULIAN"),
+        g7types.Date(year=5780, month="TSH", day=1, calendar="HEBREW"),
+        g7types.Date(year=2, month="VEND", day=1, calendar="FRENCH_R"),
+        g7types.DateApprox(
+            date=g7types.Date(year=1900, month="JAN", day=None, calendar=None),
+            approx="ABT",
+        ),
+        g7types.DatePeriod(
+            from_=None,
+            to=g7types.Date(year=1700, month="DEC", day=31, calendar="JULIAN"),
+        ),
+        g7types.DateRange(
+            start=g7types.Date(year=1800, month=None, day=None, calendar=None),
+            end=g7types.Date(year=1810, month=None, day=None, calendar=None),
+        ),
+        g7types.DateRange(start=None, end=None),
+    ]
+    sort_values = gedcom_date_sort_values(dates)
+    assert list(sort_values) == [
+        gedcom_date_value_to_gramps_date(date).get_sort_value() for date in dates
+    ]
+    assert sort_values[-1] == 0
+
+
+def test_set_change_date():
+    """Test that change dates fall back to CREA and include DATE.TIME."""
+    gedcom_structures = gedcom7.loads(
+        "0 HEAD\n"
+        "1 GEDC\n"
+        "2 VERS 7.0\n"
+        "0 @N1@ SNOTE One\n"
+        "1 CHAN\n"
+        "2 DATE 27 MAR 2022\n"
+        "3 TIME 16:02:03Z\n"
+        "0 @N2@ SNOTE Two\n"
+        "1 CREA\n"
+        "2 DATE 27 MAR 2022\n"
+        "3 TIME 16:02:03Z\n"
+        "0 @N3@ SNOTE Three\n"
+        "1 CHAN\n"
+        "2 DATE 1 JAN 2000\n"
+        "0 TRLR\n"
+    )
+    notes = [structure for structure in gedcom_structures if structure.tag == "SNOTE"]
+    expected = [
+        int(datetime(2022, 3, 27, 16, 2, 3, tzinfo=timezone.utc).timestamp()),
+        int(datetime(2022, 3, 27, 16, 2, 3, tzinfo=timezone.utc).timestamp()),
+        int(datetime(2000, 1, 1, tzinfo=timezone.utc).timestamp()),
+    ]
+    assert [set_change_date(note, Note()).change for note in notes] == expected
+
+
+def test_gramps_type_shared_but_copied():
+    """Test that prebuilt type values are shared and copied by the setters."""
+    note_type = gramps_type(NoteType, NoteType.PERSON)
+    assert gramps_type(NoteType, NoteType.PERSON) is note_type
+    assert gramps_type(EventType, "Graduation") is gramps_type(EventType, "Graduation")
+    note = Note()
+    note.set_type(note_type)
+    note.get_type().set(NoteType.EVENT)
+    assert note_type == NoteType.PERSON
+
+
+def test_indexed_structures():
+    """Test that the children of a structure are indexed once by tag."""
+    structure = g7types.GedcomStructure(
+        tag="OBJE",
+        children=[
+            g7types.GedcomStructure(tag="FILE", text="a.jpg"),
+            g7types.GedcomStructure(tag="TITL", text="Title"),
+            g7types.GedcomStructure(tag="FILE", text="b.jpg"),
+        ],
+    )
+    assert children_by_tag(structure) is not children_by_tag(structure)
+    with util.indexed_structures():
+        index = children_by_tag(structure)
+        assert children_by_tag(structure) is index
+        assert [c.text for c in children_with_tag(structure, "FILE")] == [
+            "a.jpg",
+            "b.jpg",
+        ]
+        assert first_child(structure, "TITL").text == "Title"
+        assert first_child(structure, "NOTE") is None
+        assert children_with_tag(structure, "NOTE") == []
+        # an equal structure elsewhere in the tree gets its own index
+        other = g7types.GedcomStructure(tag="OBJE", children=list(structure.children))
+        assert children_by_tag(other) is not index
+        assert children_by_tag(other) == index
+    assert first_child(structure, "FILE").text == "a.jpg"
@@ -2,11 +2,33 @@
 
 from gedcom7 import const as g7const
 from gedcom7 import types as g7types
+from gramps.gen.db import DbWriteBase
 from gramps.gen.db.utils import make_database
 
 from gramps_gedcom7 import process
 from gramps_gedcom7.settings import ImportSettings
 
+# Tables holding the serialized primary objects
+OBJECT_TABLES = [
+    "person",
+    "family",
+    "event",
+    "place",
+    "source",
+    "citation",
+    "media",
+    "repository",
+    "note",
+    "tag",
+]
+
+
+def new_database() -> DbWriteBase:
+    """Create an empty in-memory SQLite database."""
+    db: DbWriteBase = make_database("sqlite")
+    db.load(":memory:", callback=None)
+    return db
+
 
 def import_to_memory(gedcom_records: list[g7types.GedcomStructure]):
     db = make_database("sqlite")
@@ -23,3 +45,28 @@ def import_to_memory(gedcom_records: list[g7types.GedcomStructure]):
         gedcom_structures=gedcom_structures, db=db, settings=settings
     )
     return db
+
+
+def summarize(db: DbWriteBase) -> dict:
+    """Summarize the objects of a database, to compare two imports of a file."""
+    return {
+        "people": sorted(p.gramps_id for p in db.iter_people()),
+        "families": sorted(f.gramps_id for f in db.iter_families()),
+        "sources": sorted(s.gramps_id for s in db.iter_sources()),
+        "repositories": sorted(r.gramps_id for r in db.iter_repositories()),
+        "media": sorted(m.gramps_id for m in db.iter_media()),
+        "events": db.get_number_of_events(),
+        "places": db.get_number_of_places(),
+        "citations": db.get_number_of_citations(),
+        "notes": db.get_number_of_notes(),
+        "researcher": db.get_researcher().get_name(),
+    }
+
+
+def dump_tables(db: DbWriteBase, tables: list[str] = OBJECT_TABLES) -> dict:
+    """Dump the rows of database tables, ordered by handle."""
+    dump = {}
+    for table in tables:
+        db.dbapi.execute(f"SELECT * FROM {table} ORDER BY handle")
+        dump[table] = db.dbapi.fetchall()
+    return dump